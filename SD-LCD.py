@@ -1,20 +1,39 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, PhotoImage
 import threading
+import queue
+import math
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean for raw frame export
 import pygame
 import soundfile as sf
 import numpy as np
-from scipy.signal import resample_poly
-import math
+from sdlcd_frames import FramePublisher, FRAME_RING_NAME
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import time
-import os
 import sys
+import argparse
+import collections
+import shutil
+import tempfile
+import json
+import csv
+import struct
+import platform
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 script_dir = os.path.dirname(__file__)
 font_path = os.path.join(script_dir, 'imageassets', 'sd-lcd.ttf')
 
 
-NUM_SLOTS = 16
+PART_GROUPS = ["A", "B"]  # the SD-90's two 16-part groups
+PAGE_SIZE = 16  # parts shown on one LCD page
+NUM_SLOTS = PAGE_SIZE * len(PART_GROUPS)
 
 BLOCK_SIZE = 10
 GRID_COLS = 127
@@ -34,8 +53,956 @@ BAR_START_X_BLOCK = 5
 BAR_BASELINE_Y_BLOCK = GRID_ROWS - 26  # baseline (26 blocks from bottom)
 BAR_SPACING_BLOCKS = 1
 
+# Palette indices of the native LCD framebuffer
+LCD_PAPER = 0
+LCD_INK = 1
+LCD_DARK = 2  # downward bar extension
+
+# Block positions of the selected slot readout: label, instrument, patch, variant, set
+READOUT_POSITIONS = [(6, 41), (36, 41), (18, 49), (60, 49), (90, 49)]
+
 SET_OPTIONS = ["SP 1", "SP 2", "CLASIC", "CONTEM", "SOLO", "ENHANC"]
 
+
+def slot_name(i):
+    return f"{PART_GROUPS[i // PAGE_SIZE]}{i % PAGE_SIZE + 1:02}"
+
+
+def slot_presets(i):
+    # Default (instrument, patch, variant, set, set options) for a slot.
+    # Special presets for A01, A02, A03, and the A10/B10 drum parts
+    slot_label = slot_name(i)
+    if slot_label == "A01":
+        return "D.L.A.Pad", "001", "---", SET_OPTIONS[0], SET_OPTIONS
+    elif slot_label == "A02":
+        return "Blown Bass", "001", "---", SET_OPTIONS[1], SET_OPTIONS
+    elif slot_label == "A03":
+        return "SD Piano", "001", "---", SET_OPTIONS[5], SET_OPTIONS
+    elif i % PAGE_SIZE == 9:
+        return "StandardSet2", "001", "---", SET_OPTIONS[3], SET_OPTIONS[2:]
+    else:
+        return "Ac.Piano", "001", "000", SET_OPTIONS[3], SET_OPTIONS
+
+# Envelope hop and RMS window length, independent of the display rate
+ANALYSIS_HOP_MS = 20
+ANALYSIS_WINDOW_MS = 20
+DISPLAY_RATE_OPTIONS = ["30", "50", "60", "120", "144", "VSync"]
+DEFAULT_DISPLAY_RATE = 50
+VSYNC_SAFETY_FPS = 300  # cap under VSync for when presenting does not block
+TEXT_CACHE_SIZE = 128  # rendered readout strings kept by LCDRenderer
+TIMELINE_CHUNK_HOPS = 4096  # analysis hops per pass when building the bar timeline
+
+# Analysed envelopes are cached on disk, keyed by file identity and analysis settings
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sd-lcd")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+ANALYSIS_VERSION = 4  # bump whenever the analysis output changes
+ANALYSIS_BLOCK_FRAMES = 256  # envelope frames decoded per streamed block
+
+# Sample formats slot files are decoded to while streaming
+SAMPLE_STORAGE_OPTIONS = ["float32", "int16"]
+
+MIXER_BUFFER = 512  # mixer buffer in sample frames
+# Only the channel count may differ from what is asked for; SDL resamples the
+# master-rate chunks to the device rate, so the clock stays in master samples
+MIXER_ALLOWED_CHANGES = pygame.AUDIO_ALLOW_CHANNELS_CHANGE
+MASTER_CHUNK_FRAMES = 8192  # master samples handed to the mixer at a time
+MASTER_FEED_INTERVAL = 0.005  # seconds between checks of the master channel's queue
+
+DEFAULT_WORKERS = os.cpu_count() or 1  # processes used to analyse slots and export frames
+EXPORT_CHUNK_FRAMES = 250  # frames rendered per export work item
+
+MULTICHANNEL_OPTIONS = ["Channels", "Pairs"]  # one channel or one stereo pair per slot
+
+TIMING_LOG_OPTIONS = ["Off", "CSV", "JSON"]
+TIMING_STAGES = ("events", "bars", "text", "compose", "present", "flip")
+TIMING_OVERLAY_KEY = pygame.K_F3
+
+
+def accumulate_frames(sums, counts, mono, pos, sr, target_sr, step_size):
+    # Add the squares of a native-rate block starting at sample pos into the
+    # per-frame sums; mono may also be 2-D with one column per envelope, summed
+    # into matching columns of sums. Frame k covers master samples [k * step_size, (k + 1) * step_size),
+    # i.e. native samples from ceil(k * step_size * sr / target_sr) onwards.
+    span = step_size * sr
+    first = pos * target_sr // span
+    last = (pos + len(mono) - 1) * target_sr // span
+    starts = -(-np.arange(first + 1, last + 1, dtype=np.int64) * span // target_sr) - pos
+    bounds = np.concatenate(([0], starts))
+    sums[first:last + 1] += np.add.reduceat(mono * mono, bounds, dtype=np.float64)
+    counts[first:last + 1] += np.diff(bounds, append=len(mono))
+
+
+def frame_count(n_samples, sr, target_sr, step_size):
+    return -(-n_samples * target_sr // (step_size * sr))
+
+
+def analysis_steps(sr, hop_ms, window_ms):
+    # Master samples per envelope hop and the RMS window length in hops
+    step_size = max(int(round(sr * hop_ms / 1000)), 1)
+    window_hops = max(int(round(window_ms / hop_ms)), 1)
+    return step_size, window_hops
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+class SlotProgress:
+    # Progress callback for analyze_slot: reports the bytes decoded so far for
+    # one slot on a queue, and aborts the analysis once the cancel event is set.
+    # With Manager proxies for the queue and event it also works in pool workers.
+    def __init__(self, index, updates, cancel):
+        self.index = index
+        self.updates = updates
+        self.cancel = cancel
+
+    def __call__(self, decoded_bytes, total_bytes):
+        if self.cancel.is_set():
+            raise LoadCancelled()
+        self.updates.put((self.index, "decoding", decoded_bytes, total_bytes))
+
+
+def analyze_channels(path, target_sr, step_size, storage="float32", window_hops=1, group=None,
+                     progress=None):
+    # Returns (envelopes, peaks, bytes of sample data held while analysing),
+    # one envelope per group of adjacent channels: group=None mixes all channels
+    # into one, 1 keeps every channel, 2 pairs them up as stereo parts.
+    # The file is streamed at its native rate and each sample is binned into the
+    # hop covering its time, so resampled audio is never built and memory stays
+    # bounded by one block rather than the track length. Each envelope value is
+    # the RMS over the window_hops hops ending at that hop, so the bars never
+    # lead the audio (the same trailing window as LiveMeter).
+    info = sf.info(path)
+    sr = info.samplerate
+    if storage == "int16" and not info.subtype.startswith("PCM"):
+        storage = "float32"  # libsndfile does not rescale float data to int16
+    group = group or info.channels
+    n_groups = max(info.channels // group, 1)
+    n_frames = frame_count(info.frames, sr, target_sr, step_size)
+    sums = np.zeros((n_frames + 1, n_groups))
+    counts = np.zeros(n_frames + 1)
+    scale = 1.0 / 32768 if storage == "int16" else 1.0
+    peaks = np.zeros(n_groups)
+    held_bytes = 0
+    pos = 0
+    blocksize = -(-step_size * sr // target_sr) * ANALYSIS_BLOCK_FRAMES
+    total_bytes = info.frames * info.channels * np.dtype(storage).itemsize
+    decoded_bytes = 0
+    if progress:
+        progress(decoded_bytes, total_bytes)
+    for block in sf.blocks(path, blocksize=blocksize, dtype=storage, always_2d=True):
+        if len(block) == 0:
+            continue
+        # One vectorised mixdown of the interleaved block into its channel groups
+        grouped = block[:, :n_groups * group].reshape(len(block), n_groups, -1)
+        mono = grouped.mean(axis=2, dtype=np.float32)
+        if scale != 1.0:
+            mono *= scale
+        peaks = np.maximum(peaks, np.max(np.abs(mono), axis=0))
+        needed = frame_count(pos + len(mono), sr, target_sr, step_size)
+        if needed > len(sums):  # header frame count was short
+            sums = np.concatenate((sums, np.zeros((needed - len(sums), n_groups))))
+            counts = np.concatenate((counts, np.zeros(needed - len(counts))))
+        accumulate_frames(sums, counts, mono, pos, sr, target_sr, step_size)
+        held_bytes = max(held_bytes, block.nbytes + 2 * mono.nbytes)
+        pos += len(mono)
+        decoded_bytes += block.nbytes
+        if progress:
+            progress(decoded_bytes, total_bytes)
+
+    n_frames = frame_count(pos, sr, target_sr, step_size)
+    sums, counts = sums[:n_frames], counts[:n_frames]
+    if window_hops > 1:
+        starts = np.maximum(np.arange(n_frames) - window_hops + 1, 0)
+        sum_totals = np.concatenate((np.zeros((1, n_groups)), np.cumsum(sums, axis=0)))
+        count_totals = np.concatenate(([0.0], np.cumsum(counts)))
+        sums = sum_totals[1:] - sum_totals[starts]
+        counts = count_totals[1:] - count_totals[starts]
+    envelopes = np.sqrt(sums / np.maximum(counts, 1)[:, None]).T.astype(np.float32)
+    return envelopes, peaks, held_bytes
+
+
+def analyze_slot(path, target_sr, step_size, storage="float32", window_hops=1, progress=None):
+    # Returns (envelope, peak, held bytes) of one slot file mixed down to mono
+    envelopes, peaks, held_bytes = analyze_channels(
+        path, target_sr, step_size, storage, window_hops, None, progress
+    )
+    return envelopes[0], float(peaks[0]), held_bytes
+
+
+def analysis_cache_key(path, target_sr, step_size, storage, window_hops, group=None):
+    st = os.stat(path)
+    identity = "|".join(str(v) for v in (
+        ANALYSIS_VERSION, os.path.abspath(path), st.st_size, st.st_mtime_ns,
+        target_sr, step_size, window_hops, storage, group,
+    ))
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def load_cached_analysis(key):
+    path = os.path.join(CACHE_DIR, key + ".npz")
+    try:
+        with np.load(path) as cached:
+            envelope = cached["envelope"]
+            peak = cached["peak"]  # a scalar, or one per envelope row
+        os.utime(path)  # mark as recently used for LRU eviction
+    except (OSError, KeyError, ValueError):
+        return None
+    return envelope, peak
+
+
+def store_cached_analysis(key, envelope, peak):
+    path = os.path.join(CACHE_DIR, key + ".npz")
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, envelope=envelope, peak=np.asarray(peak, dtype=np.float64))
+        os.replace(tmp_path, path)
+        evict_analysis_cache()
+    except OSError:
+        pass  # the cache is only an optimisation
+
+
+def evict_analysis_cache():
+    # Drop least recently used entries until the cache fits CACHE_MAX_BYTES
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if not name.endswith(".npz"):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        os.remove(path)
+        total -= size
+
+
+def analyze_slots(paths, target_sr, step_size, storage="float32", workers=1, window_hops=1,
+                  updates=None, cancel=None):
+    # Analyse every non-empty slot, cache misses spread over a process pool.
+    # Returns one (envelope, peak, held_bytes) tuple or None per slot. With an
+    # updates queue and cancel event, (slot, stage, bytes, total) tuples report
+    # progress and setting the event raises LoadCancelled. Pool workers get
+    # Manager proxies of their own, relayed to and from these while waiting.
+    results = [None] * len(paths)
+
+    def report(i, stage, done_bytes=0, total_bytes=0):
+        if updates is not None:
+            updates.put((i, stage, done_bytes, total_bytes))
+
+    def slot_progress(i):
+        return SlotProgress(i, updates, cancel) if updates is not None else None
+
+    misses = {}
+    for i, path in enumerate(paths):
+        if path == "":
+            continue
+        try:
+            key = analysis_cache_key(path, target_sr, step_size, storage, window_hops)
+        except OSError as e:
+            raise RuntimeError(f"Error loading {path}: {e}") from e
+        cached = load_cached_analysis(key)
+        if cached is not None:
+            results[i] = (cached[0], float(cached[1]), 0)
+            report(i, "cached")
+        else:
+            misses[i] = key
+            report(i, "queued")
+
+    def collect(i, job):
+        try:
+            envelope, peak, held_bytes = job()
+        except LoadCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error loading {paths[i]}: {e}") from e
+        store_cached_analysis(misses[i], envelope, peak)
+        results[i] = (envelope, peak, held_bytes)
+        report(i, "done", held_bytes)
+
+    if workers <= 1 or len(misses) <= 1:
+        for i in misses:
+            collect(i, lambda i=i: analyze_slot(
+                paths[i], target_sr, step_size, storage, window_hops, slot_progress(i)
+            ))
+        return results
+
+    # spawn keeps workers independent of the Tk and pygame state of this process
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager() if updates is not None else None
+    if manager:
+        worker_updates, worker_cancel = manager.Queue(), manager.Event()
+
+    def worker_progress(i):
+        return SlotProgress(i, worker_updates, worker_cancel) if manager else None
+
+    def relay():
+        # Pass worker progress on to updates and a cancel request on to the workers
+        while True:
+            try:
+                updates.put(worker_updates.get_nowait())
+            except queue.Empty:
+                break
+        if cancel is not None and cancel.is_set():
+            worker_cancel.set()
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(misses)), mp_context=context) as pool:
+            jobs = {
+                pool.submit(analyze_slot, paths[i], target_sr, step_size, storage, window_hops,
+                            worker_progress(i)): i
+                for i in misses
+            }
+            # Collected as they finish, so a failing slot surfaces at once
+            pending = set(jobs)
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.1 if manager else None, return_when=FIRST_COMPLETED)
+                    if manager:
+                        relay()
+                    for job in done:
+                        collect(jobs[job], job.result)
+            except Exception:
+                for job in jobs:
+                    job.cancel()
+                if manager:
+                    worker_cancel.set()  # stop decodes already running, not just queued ones
+                raise
+    finally:
+        if manager:
+            manager.shutdown()
+    return results
+
+
+def read_vlq(data, pos):
+    # MIDI variable-length quantity at pos, returns (value, next position)
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def read_midi_events(path):
+    # Minimal Standard MIDI File reader. Returns the channel voice events as
+    # arrays sorted by time (seconds, kind, part, data1, data2), where kind is
+    # the status high nibble and part is the channel plus 16 per MIDI port
+    # (port prefix meta event), and the track name of each part's track.
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"MThd":
+        raise ValueError("not a Standard MIDI File")
+    _, n_tracks, division = struct.unpack(">HHH", data[8:14])
+    pos = 8 + int.from_bytes(data[4:8], "big")
+
+    events = []  # (tick, kind, channel, data1, data2) in file order
+    tempos = [(0, 500000)]  # (tick, microseconds per quarter note)
+    names = {}
+    for _ in range(n_tracks):
+        while data[pos:pos + 4] != b"MTrk":
+            if pos + 8 > len(data):
+                raise ValueError("truncated MIDI file")
+            pos += 8 + int.from_bytes(data[pos + 4:pos + 8], "big")  # skip unknown chunks
+        end = min(pos + 8 + int.from_bytes(data[pos + 4:pos + 8], "big"), len(data))
+        pos += 8
+        tick = 0
+        running = 0  # last channel status, reused by running-status events
+        port = 0
+        track_name = None
+        channels = set()
+        while pos < end:
+            delta, pos = read_vlq(data, pos)
+            tick += delta
+            if data[pos] & 0x80:
+                status = data[pos]
+                pos += 1
+            else:
+                status = running
+            if status == 0xFF:
+                meta = data[pos]
+                length, pos = read_vlq(data, pos + 1)
+                payload = data[pos:pos + length]
+                pos += length
+                if meta == 0x51:
+                    tempos.append((tick, int.from_bytes(payload, "big")))
+                elif meta == 0x21 and payload:
+                    port = payload[0]
+                elif meta == 0x03 and track_name is None:
+                    track_name = payload.decode("latin-1").strip()
+                elif meta == 0x2F:
+                    break
+            elif status in (0xF0, 0xF7):
+                length, pos = read_vlq(data, pos)
+                pos += length
+            elif status >= 0x80:
+                running = status
+                kind, channel = status & 0xF0, (status & 0x0F) + 16 * port
+                if kind in (0xC0, 0xD0):
+                    events.append((tick, kind, channel, data[pos], 0))
+                    pos += 1
+                else:
+                    events.append((tick, kind, channel, data[pos], data[pos + 1]))
+                    pos += 2
+                channels.add(channel)
+            else:
+                raise ValueError("running status without a preceding status byte")
+        pos = end
+        for channel in channels:
+            if track_name:
+                names.setdefault(channel, track_name)
+
+    table = np.array(events, dtype=np.int64).reshape(-1, 5)
+    ticks = table[:, 0]
+    if division & 0x8000:
+        # SMPTE timing: frames per second and ticks per frame
+        seconds = ticks / ((256 - (division >> 8)) * (division & 0xFF))
+    else:
+        # Tempo map as segments: look up each event's segment by binary search
+        tempos.sort(key=lambda t: t[0])
+        tempo_ticks = np.array([t for t, _ in tempos])
+        tempo_rates = np.array([us for _, us in tempos]) / 1e6 / division  # seconds per tick
+        starts = np.concatenate(([0.0], np.cumsum(np.diff(tempo_ticks) * tempo_rates[:-1])))
+        segment = np.searchsorted(tempo_ticks, ticks, side="right") - 1
+        seconds = starts[segment] + (ticks - tempo_ticks[segment]) * tempo_rates[segment]
+    order = np.argsort(seconds, kind="stable")
+    return (seconds[order],) + tuple(table[order, k] for k in range(1, 5)), names
+
+
+def controller_at(kinds, channels, data1, data2, channel, controller, positions, default):
+    # Value of a controller on a channel just before each of the given event
+    # positions in the time-sorted event list
+    mask = (kinds == 0xB0) & (channels == channel) & (data1 == controller)
+    cc_positions, cc_values = np.flatnonzero(mask), data2[mask]
+    if len(cc_positions) == 0:
+        return np.full(len(positions), default)
+    index = np.searchsorted(cc_positions, positions) - 1
+    return np.where(index >= 0, cc_values[np.maximum(index, 0)], default)
+
+
+def midi_slot_results(path, target_sr, step_size):
+    # Slot meters and readouts driven by a MIDI file instead of stems: MIDI
+    # channel n drives slot An, or Bn on the second port. Each hop holds the
+    # loudest note-on it contains, velocity scaled by the channel's volume (CC7)
+    # and expression (CC11) at that moment, which the bar ballistics then
+    # release like an audio level.
+    # Returns analyze_slots-style results and {slot: (instrument, patch, variant)}.
+    events, names = read_midi_events(path)
+    seconds, kinds, channels, data1, data2 = events
+    results = [None] * NUM_SLOTS
+    readouts = {}
+    for channel in range(NUM_SLOTS):
+        notes = (kinds == 0x90) & (channels == channel) & (data2 > 0)
+        in_channel = channels == channel
+        if not in_channel.any():
+            continue
+        note_times = seconds[notes]
+        note_positions = np.flatnonzero(notes)
+        volume = controller_at(*events[1:], channel, 7, note_positions, 100)
+        expression = controller_at(*events[1:], channel, 11, note_positions, 127)
+        levels = data2[notes] * volume * expression / 127 ** 3
+        hops = (note_times * target_sr // step_size).astype(int)
+        envelope = np.zeros(hops[-1] + 1 if len(hops) else 0, dtype=np.float32)
+        np.maximum.at(envelope, hops, levels)
+        if notes.any():
+            results[channel] = (envelope, 1.0, 0)
+
+        programs = np.flatnonzero((kinds == 0xC0) & in_channel)
+        banks = np.flatnonzero((kinds == 0xB0) & in_channel & (data1 == 0))
+        readouts[channel] = (
+            names.get(channel, "")[:15] or None,
+            f"{data1[programs[0]] + 1:03}" if len(programs) else None,
+            f"{data2[banks[0]]:03}" if len(banks) else None,
+        )
+    return results, readouts
+
+
+def analyze_multichannel(path, target_sr, step_size, storage="float32", window_hops=1, pairs=False,
+                         updates=None, cancel=None):
+    # Slot results from one interleaved multichannel WAV/RF64: channel n, or
+    # channel pair n with pairs, feeds slot n. All slots come from a single
+    # sequential read, which is far cheaper than one file per slot on slow
+    # storage. Decoding progress is reported under the slot index "multi".
+    group = 2 if pairs else 1
+    try:
+        key = analysis_cache_key(path, target_sr, step_size, storage, window_hops, group)
+    except OSError as e:
+        raise RuntimeError(f"Error loading {path}: {e}") from e
+    cached = load_cached_analysis(key)
+    if cached is not None:
+        envelopes, peaks = cached
+        held_bytes = 0
+    else:
+        progress = SlotProgress("multi", updates, cancel) if updates is not None else None
+        try:
+            envelopes, peaks, held_bytes = analyze_channels(
+                path, target_sr, step_size, storage, window_hops, group, progress
+            )
+        except LoadCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error loading {path}: {e}") from e
+        store_cached_analysis(key, envelopes, peaks)
+
+    results = [None] * NUM_SLOTS
+    n_slots = min(len(envelopes), NUM_SLOTS)
+    for i in range(n_slots):
+        results[i] = (envelopes[i], float(peaks[i]), held_bytes // n_slots)
+        if updates is not None:
+            updates.put((i, "cached" if cached is not None else "done", 0, 0))
+    return results
+
+
+def assemble_envelopes(results, n_frames):
+    # Lay the per-slot analysis results out on the master frame grid
+    envelopes = np.zeros((NUM_SLOTS, n_frames), dtype=np.float32)
+    peaks = np.ones(NUM_SLOTS)
+    active = np.zeros(NUM_SLOTS, dtype=bool)
+    for i, result in enumerate(results):
+        if result is None:
+            continue
+        envelope, peak, _ = result
+        n = min(len(envelope), n_frames)
+        envelopes[i, :n] = envelope[:n]
+        peaks[i] = peak if peak > 0 else 1.0
+        active[i] = True
+    return envelopes, peaks, active
+
+
+def bar_targets(levels, peaks, sensitivity):
+    # Normalised RMS levels to target bar heights in blocks, snapping to full
+    # height once within 2% of the top
+    targets = np.minimum(levels / peaks * sensitivity, 1.0) * BAR_MAX_HEIGHT_BLOCKS
+    return np.where(targets >= BAR_MAX_HEIGHT_BLOCKS * 0.98, BAR_MAX_HEIGHT_BLOCKS, targets)
+
+
+def compute_bar_timeline(envelopes, peaks, active, sensitivity, release, frame_dt):
+    # Bar height in blocks for every slot and analysis hop, frame_dt seconds apart.
+    # Instant attack with exponential release, h[n] = max(t[n], h[n-1] * d), unrolls
+    # to h[n] = max_k<=n t[k] * d**(n - k), which in log space is a running
+    # maximum, so the whole table takes a few array passes. Only active slots
+    # are computed, TIMELINE_CHUNK_HOPS at a time with the last height carried
+    # into the next chunk, so temporaries stay small however long the set is.
+    heights = np.zeros(envelopes.shape, dtype=np.float32)
+    rows = np.flatnonzero(active)
+    rate = frame_dt / max(release, 1e-4)  # -log(decay) per frame
+    last = np.full(len(rows), -np.inf)  # log height at the end of the previous chunk
+    with np.errstate(divide='ignore'):
+        for start in range(0, envelopes.shape[1], TIMELINE_CHUNK_HOPS):
+            targets = bar_targets(
+                envelopes[rows, start:start + TIMELINE_CHUNK_HOPS], peaks[rows, None], sensitivity
+            )
+            ramp = rate * np.arange(targets.shape[1])
+            log_heights = np.maximum(
+                np.maximum.accumulate(np.log(targets) + ramp, axis=1), (last - rate)[:, None]
+            ) - ramp
+            heights[rows, start:start + targets.shape[1]] = np.exp(log_heights)
+            last = log_heights[:, -1]
+    return heights
+
+
+def hop_position(sample, step_size):
+    # Fractional hop to show at a master sample (or array of them). Hop k's
+    # window ends at sample (k + 1) * step_size, so hop k is reached exactly
+    # when its audio has been heard and the bars never run ahead of it.
+    return sample / step_size - 1
+
+
+def bar_heights_at(timeline, position):
+    # Whole-block bar heights at a fractional hop position (or an array of them,
+    # giving one column per display frame), interpolated between hops. Before
+    # hop 0 the bars rise from silence.
+    if timeline.shape[1] == 0:
+        return np.zeros(timeline.shape[:1] + np.shape(position), dtype=np.int16)
+    last = timeline.shape[1] - 1
+    position = np.clip(position, -1, last)
+    index = np.floor(position).astype(int)
+    upper = np.minimum(index + 1, last)
+    frac = position - index
+    lower = np.where(index >= 0, timeline[:, np.maximum(index, 0)], 0)
+    heights = lower * (1 - frac) + timeline[:, upper] * frac
+    return np.floor(heights + 1e-4).astype(np.int16)
+
+
+class TimelineBuilder:
+    # Owns the bar timeline of the live window and rebuilds it on its own thread
+    # when the ballistics change. The render thread keeps drawing from the
+    # previous table meanwhile, and slider positions passed while a rebuild runs
+    # are skipped in favour of the latest one.
+    def __init__(self, envelopes, peaks, active, frame_dt, ballistics):
+        self.args = (envelopes, peaks, active)
+        self.frame_dt = frame_dt
+        self.timeline = compute_bar_timeline(*self.args, *ballistics, frame_dt)
+        self.built = self.wanted = ballistics
+        self.closed = False
+        self.changed = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def request(self, ballistics):
+        with self.changed:
+            if ballistics != self.wanted:
+                self.wanted = ballistics
+                self.changed.notify()
+
+    def run(self):
+        while True:
+            with self.changed:
+                while self.wanted == self.built and not self.closed:
+                    self.changed.wait()
+                if self.closed:
+                    return
+                ballistics = self.wanted
+            self.timeline = compute_bar_timeline(*self.args, *ballistics, self.frame_dt)
+            self.built = ballistics
+
+    def close(self):
+        with self.changed:
+            self.closed = True
+            self.changed.notify()
+        self.thread.join()
+
+
+class LCDRenderer:
+    # Builds each frame as a GRID_COLS x GRID_ROWS array of palette indices
+    # (background, selected slot readout and bars), then scales it onto the
+    # target surface in one pass and draws the grid lines on top. Drawing cost
+    # does not depend on the window size.
+    def __init__(self):
+        bg_image_normal = pygame.image.load(os.path.join(script_dir, 'imageassets', 'base.png'))
+        bg_image_invert = pygame.image.load(os.path.join(script_dir, 'imageassets', 'contrast.png'))
+        self.bg_index = {
+            False: self.block_indices(bg_image_normal, BAR_COLOR_NORMAL),
+            True: self.block_indices(bg_image_invert, BAR_COLOR_INVERT),
+        }
+        # At this size the LCD font renders exactly one pixel per block
+        self.font = pygame.font.Font(font_path, 7)
+        self.text_cache = collections.OrderedDict()
+
+        self.frame = np.zeros((GRID_COLS, GRID_ROWS), dtype=np.uint8)
+        self.bar_columns = np.full(GRID_COLS, -1)  # bar position on the page per column
+        for i in range(PAGE_SIZE):
+            base_x = BAR_START_X_BLOCK + i * (BAR_WIDTH_BLOCKS + BAR_SPACING_BLOCKS) + 1
+            self.bar_columns[base_x:base_x + BAR_WIDTH_BLOCKS] = i
+        self.bar_rows = np.arange(BAR_BASELINE_Y_BLOCK - BAR_MAX_HEIGHT_BLOCKS, BAR_BASELINE_Y_BLOCK)
+
+        # Areas that can change between frames: one column band per bar (bar,
+        # indicator and downward extension) and the readout rows
+        readout_top = min(y for _, y in READOUT_POSITIONS)
+        self.regions = []
+        for i in range(PAGE_SIZE):
+            base_x = BAR_START_X_BLOCK + i * (BAR_WIDTH_BLOCKS + BAR_SPACING_BLOCKS) + 1
+            self.regions.append((base_x, self.bar_rows[0], BAR_WIDTH_BLOCKS, readout_top - self.bar_rows[0]))
+        self.regions.append((0, readout_top, GRID_COLS, GRID_ROWS - readout_top))
+
+        self.native = None
+        self.palettes = {}
+        self.grid_lines = {}
+
+    @staticmethod
+    def block_indices(image, ink_color):
+        # The background images are drawn on the block grid, so one sample per block is enough
+        centers = pygame.surfarray.array3d(image)[BLOCK_SIZE // 2::BLOCK_SIZE, BLOCK_SIZE // 2::BLOCK_SIZE]
+        return np.where((centers == ink_color).all(axis=2), LCD_INK, LCD_PAPER).astype(np.uint8)
+
+    def render_text(self, text):
+        # Readout values only change on slot selection or edits, so rendered
+        # strings are kept in a small LRU cache as block masks
+        mask = self.text_cache.get(text)
+        if mask is None:
+            surf = self.font.render(text, False, (255, 255, 255), (0, 0, 0))
+            mask = pygame.surfarray.array_red(surf) > 127
+            self.text_cache[text] = mask
+            if len(self.text_cache) > TEXT_CACHE_SIZE:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(text)
+        return mask
+
+    def compose(self, heights, selected, slot_text, contrast=False, bar_down_ext=None):
+        # Fill self.frame with the palette indices of one LCD frame. heights and
+        # bar_down_ext cover all parts; the page holding the selected part is shown.
+        frame = self.frame
+        page_columns = selected // PAGE_SIZE * PAGE_SIZE + self.bar_columns
+        np.copyto(frame, self.bg_index[contrast])
+
+        for text, (x, y) in zip(slot_text, READOUT_POSITIONS):
+            mask = self.render_text(text)
+            w = min(mask.shape[0], GRID_COLS - x)
+            h = min(mask.shape[1], GRID_ROWS - y)
+            frame[x:x + w, y:y + h][mask[:w, :h]] = LCD_INK
+
+        # Bars: every bar column is lit from the baseline up to its slot's height
+        in_bar = self.bar_columns >= 0
+        column_heights = np.where(in_bar, np.asarray(heights)[page_columns], 0)
+        lit = self.bar_rows[None, :] >= BAR_BASELINE_Y_BLOCK - column_heights[:, None]
+        frame[:, self.bar_rows[0]:BAR_BASELINE_Y_BLOCK][lit] = LCD_INK
+
+        if bar_down_ext is not None and max(bar_down_ext) > 0:
+            column_ext = np.where(in_bar, np.asarray(bar_down_ext)[page_columns], 0)
+            ext_rows = np.arange(max(bar_down_ext))
+            ext = ext_rows[None, :] < column_ext[:, None]
+            frame[:, BAR_BASELINE_Y_BLOCK:BAR_BASELINE_Y_BLOCK + len(ext_rows)][ext] = LCD_DARK
+
+        # Selected bar indicator
+        frame[self.bar_columns == selected % PAGE_SIZE, BAR_BASELINE_Y_BLOCK] = LCD_INK
+        return frame
+
+    def dirty_regions(self, previous, frame):
+        # Block rects (x, y, w, h) of the bars and readout rows that differ
+        # between two composed frames; None when something else changed
+        changed = previous != frame
+        if not changed.any():
+            return []
+        rects = []
+        for rect in self.regions:
+            x, y, w, h = rect
+            if changed[x:x + w, y:y + h].any():
+                changed[x:x + w, y:y + h] = False
+                rects.append(rect)
+        return None if changed.any() else rects
+
+    def present(self, screen, frame, contrast=False, grid=True, dirty=None):
+        # Scale a composed frame onto screen and draw the grid over it. With a
+        # list of dirty block rects only those areas are redrawn. Returns the
+        # screen rects that changed.
+        if self.native is None or self.native.get_bitsize() != screen.get_bitsize() \
+                or self.native.get_masks() != screen.get_masks():
+            self.native = pygame.Surface((GRID_COLS, GRID_ROWS), 0, screen)
+            self.palettes = {}
+        colors = self.palettes.get(contrast)
+        if colors is None:
+            paper, ink = (BAR_COLOR_NORMAL, BAR_COLOR_INVERT) if contrast else (BAR_COLOR_INVERT, BAR_COLOR_NORMAL)
+            dark = tuple(max(c - 80, 0) for c in ink)
+            colors = np.array([self.native.map_rgb(c) for c in (paper, ink, dark)], dtype=np.uint32)
+            self.palettes[contrast] = colors
+
+        pygame.surfarray.blit_array(self.native, colors[frame])
+        size = screen.get_size()
+        lines = self.grid_lines.get(size)
+        if lines is None:
+            lines = (np.arange(GRID_COLS) * size[0] // GRID_COLS, np.arange(GRID_ROWS) * size[1] // GRID_ROWS)
+            self.grid_lines[size] = lines
+
+        if dirty is None:
+            pygame.transform.scale(self.native, size, screen)
+            screen_rects = [screen.get_rect()]
+        else:
+            screen_rects = []
+            for x, y, w, h in dirty:
+                x0, y0 = x * size[0] // GRID_COLS, y * size[1] // GRID_ROWS
+                x1, y1 = (x + w) * size[0] // GRID_COLS, (y + h) * size[1] // GRID_ROWS
+                screen_rect = pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+                pygame.transform.scale(
+                    self.native.subsurface((x, y, w, h)), screen_rect.size, screen.subsurface(screen_rect)
+                )
+                screen_rects.append(screen_rect)
+
+        if grid:
+            pixels = pygame.surfarray.pixels2d(screen)
+            for rect in screen_rects:
+                xs = lines[0][(lines[0] >= rect.left) & (lines[0] < rect.right)]
+                ys = lines[1][(lines[1] >= rect.top) & (lines[1] < rect.bottom)]
+                pixels[xs, rect.top:rect.bottom] = colors[LCD_INK]
+                pixels[rect.left:rect.right, ys] = colors[LCD_INK]
+            del pixels
+        return screen_rects
+
+    def draw(self, screen, heights, selected, slot_text, contrast=False, grid=True, bar_down_ext=None):
+        frame = self.compose(heights, selected, slot_text, contrast, bar_down_ext)
+        self.present(screen, frame, contrast, grid)
+
+class MasterPlayer:
+    # Streams the master from disk through one mixer channel as a queue of short
+    # chunks, so only two chunks are ever in memory. The queue is topped up by a
+    # feeder thread of its own, so a slow frame on the render thread cannot
+    # starve the mixer. The player also derives the playback
+    # position from the audio itself: every chunk boundary the mixer crosses
+    # pins the clock to a known sample, so wall-clock drift and stalls cannot
+    # accumulate beyond one update interval. The position is reported for the
+    # speaker, i.e. minus the mixer buffer and a user offset.
+    def __init__(self, path, sr, latency=0.0):
+        self.file = sf.SoundFile(path)
+        self.length = self.file.frames  # from the header; shortened if the data ends early
+        self.mixer_channels = pygame.mixer.get_init()[2]
+        self.sr = sr
+        self.latency = MIXER_BUFFER / sr + latency
+        self.channel = None
+        self.next_start = 0  # first sample not yet submitted to the mixer
+        self.chunk_starts = collections.deque()  # start samples of the playing and queued chunks
+        self.anchor = (0.0, 0.0)  # (sample, perf_counter time) pair, replaced as a whole
+        self.last_update = 0.0
+        self.done = False
+        self.thread = None
+
+    def read_chunk(self):
+        # Next chunk in the mixer's format: int16 with its channel count
+        data = self.file.read(MASTER_CHUNK_FRAMES, dtype="int16", always_2d=True)
+        if data.shape[1] < self.mixer_channels:
+            data = np.repeat(data[:, :1], self.mixer_channels, axis=1)
+        return np.ascontiguousarray(data[:, :self.mixer_channels])
+
+    def submit(self):
+        start = self.next_start
+        data = self.read_chunk()
+        if len(data) == 0:
+            self.length = start
+            return False
+        chunk = pygame.sndarray.make_sound(data)
+        if self.channel.get_busy():
+            self.channel.queue(chunk)
+        else:
+            self.channel.play(chunk)
+        self.chunk_starts.append(start)
+        self.next_start = start + len(data)
+        if len(data) < MASTER_CHUNK_FRAMES:
+            self.length = self.next_start
+        return True
+
+    def start(self):
+        self.channel = pygame.mixer.find_channel(True)
+        self.submit()
+        now = time.perf_counter()
+        self.anchor, self.last_update = (0.0, now), now
+        self.update()
+        self.thread = threading.Thread(target=self.feed, daemon=True)
+        self.thread.start()
+
+    def feed(self):
+        # Feeder thread: runs until the end of the master or stop()
+        while not self.done:
+            time.sleep(MASTER_FEED_INTERVAL)
+            self.update()
+
+    def update(self):
+        # Keep one chunk queued behind the playing one and re-anchor the clock
+        # when the mixer moves on to a new chunk
+        if self.done:
+            return
+        now = time.perf_counter()
+        try:
+            busy = self.channel.get_busy()
+            if not busy:
+                # Ran dry: either the end of the file or a stall longer than a chunk
+                self.chunk_starts.clear()
+                if self.next_start >= self.length or not self.submit():
+                    self.done = True
+                    return
+                self.anchor = (self.chunk_starts[0], now)
+            elif len(self.chunk_starts) > 1 and self.channel.get_queue() is None:
+                # The queued chunk started somewhere between the last update and now
+                self.chunk_starts.popleft()
+                boundary = self.chunk_starts[0]
+                anchor_sample, anchor_time = self.anchor
+                estimate = anchor_sample + (now - anchor_time) * self.sr
+                latest = boundary + (now - self.last_update) * self.sr
+                if estimate < boundary or estimate > latest:
+                    self.anchor = (boundary if estimate < boundary else latest, now)
+            if len(self.chunk_starts) < 2 and self.next_start < self.length:
+                self.submit()
+        except pygame.error:
+            self.done = True  # mixer shut down by stop_render
+        self.last_update = now
+
+    def position(self):
+        # Sample index of the master currently coming out of the speakers
+        anchor_sample, anchor_time = self.anchor
+        mixed = anchor_sample + (time.perf_counter() - anchor_time) * self.sr
+        mixed = min(mixed, self.next_start)  # never ahead of what was submitted
+        return int(mixed - self.latency * self.sr)
+
+    def stop(self):
+        # Safe from any thread; the file stays open until close()
+        self.done = True
+        if self.channel is not None:
+            try:
+                self.channel.stop()
+            except pygame.error:
+                pass  # mixer already shut down by stop_render
+
+    def close(self):
+        # Owner thread only, once it no longer reads the position
+        self.stop()
+        if self.thread is not None:
+            self.thread.join()
+        self.file.close()
+
+
+# Frozen copy of the Tk settings handed to the render thread, which never calls
+# into the Tcl interpreter itself; readouts holds the five readout texts per slot
+RenderSettings = collections.namedtuple("RenderSettings", [
+    "sensitivity", "release", "contrast", "grid", "readouts",
+    "display_rate", "latency", "timing_log", "master_path", "publish_frames", "frame_ring",
+])
+
+
+class FrameTimer:
+    # Per-frame stage timings for the live window. A frame counts as missed when
+    # clock.tick reports more than 1.5 frame periods since the previous one.
+    def __init__(self, fps):
+        self.budget_ms = 1000 / fps
+        self.stages = {stage: [] for stage in TIMING_STAGES}
+        self.intervals = []
+        self.missed = 0
+        self.overlay = False
+        self.font = pygame.font.Font(font_path, 14)
+        self.frame_start = self.mark_time = time.perf_counter()
+
+    def start(self):
+        self.frame_start = self.mark_time = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages[stage].append((now - self.mark_time) * 1000)
+        self.mark_time = now
+
+    def end(self, interval_ms):
+        for times in self.stages.values():
+            if len(times) < len(self.intervals) + 1:
+                times.append(0.0)  # stage skipped this frame
+        self.intervals.append(interval_ms)
+        self.missed += interval_ms > self.budget_ms * 1.5
+
+    def draw_overlay(self, screen):
+        # Frame rate, work time and missed frames of the last second, top left
+        recent = slice(-max(int(1000 / self.budget_ms), 1), None)
+        if not self.intervals:
+            return screen.get_rect(width=0, height=0)
+        rate = 1000 / max(np.mean(self.intervals[recent]), 1e-3)
+        work = sum(np.mean(times[recent]) for times in self.stages.values())
+        text = f"{rate:.0f} FPS  {work:.2f} ms  missed {self.missed}"
+        label = self.font.render(text, False, (255, 255, 255), (0, 0, 0))
+        return screen.blit(label, (4, 4))
+
+    def write_log(self, path):
+        n = len(self.intervals)
+        columns = {stage: times[:n] for stage, times in self.stages.items()}
+        columns["interval"] = self.intervals
+        if path.endswith(".json"):
+            log = {
+                "budget_ms": self.budget_ms,
+                "frames": n,
+                "missed": int(self.missed),
+                "summary_ms": {name: timing_summary(np.asarray(times) / 1000)
+                               for name, times in columns.items() if times},
+                "frame_ms": {name: [round(t, 4) for t in times] for name, times in columns.items()},
+            }
+            with open(path, "w") as f:
+                json.dump(log, f, indent=2)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + [f"{name}_ms" for name in columns] + ["missed"])
+                for k in range(n):
+                    row = [round(columns[name][k], 4) for name in columns]
+                    writer.writerow([k] + row + [int(self.intervals[k] > self.budget_ms * 1.5)])
+
+
 class SD90Visualizer:
     def __init__(self):
 
@@ -52,29 +1019,61 @@ class SD90Visualizer:
         self.set_vars = []
 
         self.master_path = tk.StringVar()
+        self.midi_path = tk.StringVar()  # drives the slot meters instead of the WAVs when set
+        self.multichannel_path = tk.StringVar()  # one interleaved WAV feeding all slots
+        self.multichannel_mode = tk.StringVar(value=MULTICHANNEL_OPTIONS[0])
+        self.slot_status = []  # loading progress shown next to each slot
+        self.config_page = tk.IntVar(value=0)  # part group shown in the slot list
+        self.page_widgets = [[] for _ in PART_GROUPS]
+        self.master_status = tk.StringVar()
 
         self.bar_sensitivity = tk.DoubleVar(value=1.0)  # Amplification gain
         self.bar_release = tk.DoubleVar(value=0.5)      # Release decay time (seconds)
         self.contrast_mode = tk.BooleanVar(value=False)
         self.grid_enabled = tk.BooleanVar(value=True)
+        self.sample_storage = tk.StringVar(value=SAMPLE_STORAGE_OPTIONS[0])
+        self.analysis_workers = tk.IntVar(value=DEFAULT_WORKERS)
+        self.audio_latency = tk.DoubleVar(value=0.0)  # Extra output latency (milliseconds)
+        self.display_rate = tk.StringVar(value=str(DEFAULT_DISPLAY_RATE))
+        self.analysis_hop = tk.IntVar(value=ANALYSIS_HOP_MS)
+        self.analysis_window = tk.IntVar(value=ANALYSIS_WINDOW_MS)
+        self.timing_log = tk.StringVar(value=TIMING_LOG_OPTIONS[0])  # frame timing instrumentation
+        self.publish_frames = tk.BooleanVar(value=False)  # shared-memory frame ring for other processes
+        self.frame_ring = tk.StringVar(value=FRAME_RING_NAME)  # its name, unique per running instance
 
         self.is_playing = False
         self.stop_flag = False
-        self.channels_data = []
-        self.channels_sr = []
+        self.load_thread = None  # background thread reading the master and analysing slots
+        self.load_updates = None  # progress tuples from the loader and analysis workers
+        self.load_cancel = None
+        self.load_result = None
+        self.envelopes = None
+        self.peaks = np.ones(NUM_SLOTS)
+        self.active_slots = np.zeros(NUM_SLOTS, dtype=bool)
         self.master_sr = 44100
         self.master_len = 0
+        self.step_size = 0  # master samples per envelope hop
 
-        pygame.mixer.init(frequency=self.master_sr, channels=2, size=-16, buffer=512)
+        pygame.mixer.init(frequency=self.master_sr, channels=2, size=-16, buffer=MIXER_BUFFER,
+                          allowedchanges=MIXER_ALLOWED_CHANGES)
 
         self.render_thread = None
-        self.master_sound = None  # pygame Sound object for master audio
+        self.render_settings = None  # RenderSettings snapshot the render thread starts with
+        self.settings_queue = queue.Queue()  # newer snapshots published while playing
+        self.master_file = None  # master WAV of the loaded session, streamed during playback
+        self.master_player = None  # MasterPlayer streaming master_file to the mixer
+        self.frame_publisher = None  # FramePublisher handed to the render thread, which closes it
 
         # For keyboard selection and downward pixel extension per bar
         self.selected_bar = 0
         self.bar_down_ext = [0] * NUM_SLOTS  # Downward pixel count below baseline per bar
 
         self.create_widgets()
+        for var in (
+            self.bar_sensitivity, self.bar_release, self.contrast_mode, self.grid_enabled,
+            *self.instrument_vars, *self.patch_vars, *self.variant_vars, *self.set_vars,
+        ):
+            var.trace_add("write", self.publish_settings)
         self.root.bind("<Left>", self.on_key_left)
         self.root.bind("<Right>", self.on_key_right)
 
@@ -96,14 +1095,24 @@ class SD90Visualizer:
         left_frame = tk.Frame(self.root)
         left_frame.grid(row=0, column=0, padx=10, pady=10)
 
-        headers = ["Channel", "WAV", "Name", "Inst", "Variat", "Set"]
+        # Part group pages: both groups share the same grid rows, only one is shown
+        page_frame = tk.Frame(left_frame)
+        page_frame.grid(row=0, column=0, columnspan=7, sticky="w", padx=4)
+        for page, group in enumerate(PART_GROUPS):
+            tk.Radiobutton(
+                page_frame, text=f"Part {group}", variable=self.config_page, value=page,
+                indicatoron=False, width=8, command=self.show_config_page
+            ).grid(row=0, column=page)
+
+        headers = ["Channel", "WAV", "Name", "Inst", "Variat", "Set", "Status"]
         for col, header in enumerate(headers):
             lbl = tk.Label(left_frame, text=header, font=("Arial", 10, "bold"))
-            lbl.grid(row=0, column=col, padx=5, pady=2)
+            lbl.grid(row=1, column=col, padx=5, pady=2)
 
         for i in range(NUM_SLOTS):
-            row = i + 1
-            slot_label = f"A{i+1:02}"
+            row = i % PAGE_SIZE + 2
+            slot_label = slot_name(i)
+            drum_part = i % PAGE_SIZE == 9
 
             lbl_slot = tk.Label(left_frame, text=slot_label, font=("Arial", 10))
             lbl_slot.grid(row=row, column=0, padx=(4, 6), sticky="w")
@@ -115,37 +1124,7 @@ class SD90Visualizer:
             btn_browse = tk.Button(left_frame, text="Browse", command=lambda v=path_var: self.browse_wav(v))
             btn_browse.grid(row=row, column=1, sticky="e", padx=2)
 
-            # Special presets for A01, A02, A03, and A10
-            if slot_label == "A01":
-                instrument_val = "D.L.A.Pad"
-                patch_val = "001"
-                variant_val = "---"
-                set_val = SET_OPTIONS[0]
-                set_options = SET_OPTIONS
-            elif slot_label == "A02":
-                instrument_val = "Blown Bass"
-                patch_val = "001"
-                variant_val = "---"
-                set_val = SET_OPTIONS[1]
-                set_options = SET_OPTIONS
-            elif slot_label == "A03":
-                instrument_val = "SD Piano"
-                patch_val = "001"
-                variant_val = "---"
-                set_val = SET_OPTIONS[5]
-                set_options = SET_OPTIONS
-            elif slot_label == "A10":
-                instrument_val = "StandardSet2"
-                patch_val = "001"
-                variant_val = "---"
-                set_options = SET_OPTIONS[2:]
-                set_val = SET_OPTIONS[3]
-            else:
-                instrument_val = "Ac.Piano"
-                patch_val = "001"
-                variant_val = "000"
-                set_options = SET_OPTIONS
-                set_val = SET_OPTIONS[3]
+            instrument_val, patch_val, variant_val, set_val, set_options = slot_presets(i)
 
             instrument_var = tk.StringVar(value=instrument_val)
             self.instrument_vars.append(instrument_var)
@@ -172,7 +1151,16 @@ class SD90Visualizer:
             cmb_set = ttk.Combobox(left_frame, values=set_options, textvariable=set_var, width=8, state="readonly")
             cmb_set.grid(row=row, column=5, padx=2, pady=1)
 
-            if slot_label == "A10":
+            status_var = tk.StringVar()
+            self.slot_status.append(status_var)
+            lbl_status = tk.Label(left_frame, textvariable=status_var, width=16, anchor="w")
+            lbl_status.grid(row=row, column=6, padx=2)
+
+            self.page_widgets[i // PAGE_SIZE].extend(
+                [lbl_slot, ent_path, btn_browse, ent_inst, ent_patch, ent_var, cmb_set, lbl_status]
+            )
+
+            if drum_part:
                 ent_var.config(state='readonly')
             else:
                 cmb_set.bind(
@@ -184,18 +1172,43 @@ class SD90Visualizer:
                             validatecommand=(self.root.register(self.validate_three_digit), '%P'))
                 ent_var.bind("<FocusOut>", lambda e, v=variant_var: self.zero_pad(v))
 
-            if slot_label != "A10":
+            if not drum_part:
                 self.on_set_change(SET_OPTIONS.index(set_var.get()), variant_var, ent_var)
 
+        self.show_config_page()
+
         # Master WAV path
-        tk.Label(left_frame, text="Master").grid(row=NUM_SLOTS + 1, column=0, sticky="w", padx=5, pady=10)
+        master_row = PAGE_SIZE + 2
+        tk.Label(left_frame, text="Master").grid(row=master_row, column=0, sticky="w", padx=5, pady=10)
         ent_master = tk.Entry(left_frame, textvariable=self.master_path, width=30)
-        ent_master.grid(row=NUM_SLOTS + 1, column=1, columnspan=2, sticky="w", padx=5, pady=10)
+        ent_master.grid(row=master_row, column=1, columnspan=2, sticky="w", padx=5, pady=10)
         btn_master_browse = tk.Button(left_frame, text="Browse", command=self.browse_master)
-        btn_master_browse.grid(row=NUM_SLOTS + 1, column=2, sticky="w", padx=0, pady=10)
+        btn_master_browse.grid(row=master_row, column=2, sticky="w", padx=0, pady=10)
+        tk.Label(left_frame, textvariable=self.master_status, width=16, anchor="w").grid(
+            row=master_row, column=6, padx=2
+        )
+
+        # Optional MIDI file driving the meters and readouts instead of the slot WAVs
+        tk.Label(left_frame, text="MIDI").grid(row=master_row + 1, column=0, sticky="w", padx=5)
+        ent_midi = tk.Entry(left_frame, textvariable=self.midi_path, width=30)
+        ent_midi.grid(row=master_row + 1, column=1, columnspan=2, sticky="w", padx=5)
+        btn_midi_browse = tk.Button(left_frame, text="Browse", command=self.browse_midi)
+        btn_midi_browse.grid(row=master_row + 1, column=2, sticky="w", padx=0)
+
+        # Optional multichannel WAV feeding the slots from its channels or channel pairs
+        tk.Label(left_frame, text="Multi").grid(row=master_row + 2, column=0, sticky="w", padx=5)
+        ent_multi = tk.Entry(left_frame, textvariable=self.multichannel_path, width=30)
+        ent_multi.grid(row=master_row + 2, column=1, columnspan=2, sticky="w", padx=5)
+        btn_multi_browse = tk.Button(left_frame, text="Browse", command=self.browse_multichannel)
+        btn_multi_browse.grid(row=master_row + 2, column=2, sticky="w", padx=0)
+        cmb_multi = ttk.Combobox(
+            left_frame, values=MULTICHANNEL_OPTIONS, textvariable=self.multichannel_mode,
+            width=8, state="readonly"
+        )
+        cmb_multi.grid(row=master_row + 2, column=3, columnspan=2, sticky="w", padx=2)
 
         # Control Buttons
-        control_row = NUM_SLOTS + 2
+        control_row = master_row + 3
         btn_master_reset = tk.Button(left_frame, text="Reset", command=self.master_reset)
         btn_master_reset.grid(row=control_row, column=1, padx=5, pady=10)
 
@@ -239,14 +1252,88 @@ class SD90Visualizer:
         grid_chk = tk.Checkbutton(right_frame, text="Enable Grid", variable=self.grid_enabled)
         grid_chk.grid(row=4, column=0, columnspan=2, sticky="w", padx=5, pady=5)
 
+        tk.Label(right_frame, text="Sample Storage:").grid(
+            row=5, column=0, sticky="w", padx=5, pady=5
+        )
+        cmb_storage = ttk.Combobox(
+            right_frame, values=SAMPLE_STORAGE_OPTIONS, textvariable=self.sample_storage,
+            width=8, state="readonly"
+        )
+        cmb_storage.grid(row=5, column=1, sticky="w", padx=5, pady=5)
+
+        tk.Label(right_frame, text="Analysis Workers:").grid(
+            row=6, column=0, sticky="w", padx=5, pady=5
+        )
+        spn_workers = tk.Spinbox(
+            right_frame, from_=1, to=max(DEFAULT_WORKERS, 32), textvariable=self.analysis_workers,
+            width=5, state="readonly"
+        )
+        spn_workers.grid(row=6, column=1, sticky="w", padx=5, pady=5)
+
+        tk.Label(right_frame, text="Audio Latency (ms):").grid(
+            row=7, column=0, sticky="w", padx=5, pady=5
+        )
+        latency_scale = tk.Scale(
+            right_frame, from_=-200, to=500, resolution=5, orient=tk.HORIZONTAL,
+            variable=self.audio_latency, length=150
+        )
+        latency_scale.grid(row=7, column=1, padx=5, pady=5)
+
+        tk.Label(right_frame, text="Display Rate (FPS):").grid(
+            row=8, column=0, sticky="w", padx=5, pady=5
+        )
+        cmb_rate = ttk.Combobox(
+            right_frame, values=DISPLAY_RATE_OPTIONS, textvariable=self.display_rate,
+            width=8, state="readonly"
+        )
+        cmb_rate.grid(row=8, column=1, sticky="w", padx=5, pady=5)
+
+        tk.Label(right_frame, text="Analysis Hop / Window (ms):").grid(
+            row=9, column=0, sticky="w", padx=5, pady=5
+        )
+        analysis_frame = tk.Frame(right_frame)
+        analysis_frame.grid(row=9, column=1, sticky="w", padx=5, pady=5)
+        tk.Spinbox(
+            analysis_frame, from_=5, to=100, increment=5, textvariable=self.analysis_hop,
+            width=4, state="readonly"
+        ).grid(row=0, column=0)
+        tk.Spinbox(
+            analysis_frame, from_=5, to=400, increment=5, textvariable=self.analysis_window,
+            width=4, state="readonly"
+        ).grid(row=0, column=1, padx=(5, 0))
+
+        tk.Label(right_frame, text="Frame Timing Log (F3 overlay):").grid(
+            row=10, column=0, sticky="w", padx=5, pady=5
+        )
+        cmb_timing = ttk.Combobox(
+            right_frame, values=TIMING_LOG_OPTIONS, textvariable=self.timing_log,
+            width=8, state="readonly"
+        )
+        cmb_timing.grid(row=10, column=1, sticky="w", padx=5, pady=5)
+
+        publish_chk = tk.Checkbutton(
+            right_frame, text="Publish Frames to Shared Memory:", variable=self.publish_frames
+        )
+        publish_chk.grid(row=11, column=0, sticky="w", padx=5, pady=5)
+        ent_ring = tk.Entry(right_frame, textvariable=self.frame_ring, width=14)
+        ent_ring.grid(row=11, column=1, sticky="w", padx=5, pady=5)
+
         self.img1 = PhotoImage(file="imageassets/edirol.png")
         img_box1 = tk.Label(right_frame, image=self.img1)
-        img_box1.grid(row=5, column=0, columnspan=2, pady=(70, 5), padx=5)
+        img_box1.grid(row=12, column=0, columnspan=2, pady=(10, 5), padx=5)
 
         self.img2 = PhotoImage(file="imageassets/creds.png")
         img_box2 = tk.Label(right_frame, image=self.img2)
-        img_box2.grid(row=6, column=0, columnspan=2, pady=(55, 5), padx=5)
+        img_box2.grid(row=13, column=0, columnspan=2, pady=(20, 5), padx=5)
+
 
+    def show_config_page(self):
+        for page, widgets in enumerate(self.page_widgets):
+            for widget in widgets:
+                if page == self.config_page.get():
+                    widget.grid()
+                else:
+                    widget.grid_remove()
 
     def master_reset(self):
         python = sys.executable
@@ -279,6 +1366,16 @@ class SD90Visualizer:
         if path:
             self.master_path.set(path)
 
+    def browse_midi(self):
+        path = filedialog.askopenfilename(filetypes=[("MIDI files", "*.mid *.midi")])
+        if path:
+            self.midi_path.set(path)
+
+    def browse_multichannel(self):
+        path = filedialog.askopenfilename(filetypes=[("WAV files", "*.wav *.rf64")])
+        if path:
+            self.multichannel_path.set(path)
+
     def bulk_import_wavs(self):
         paths = filedialog.askopenfilenames(filetypes=[("WAV files", "*.wav")])
         for i, path in enumerate(paths):
@@ -287,61 +1384,203 @@ class SD90Visualizer:
             self.wav_paths[i].set(path)
 
     def start_render(self):
-        if self.is_playing:
+        if self.is_playing or self.load_thread:
             messagebox.showwarning("Already Running", "Rendering already in progress.")
             return
 
-        self.channels_data = []
-        self.channels_sr = []
-
-        for i in range(NUM_SLOTS):
-            path = self.wav_paths[i].get()
-            if path == "":
-                self.channels_data.append(None)
-                self.channels_sr.append(0)
-                continue
-            try:
-                data, sr = sf.read(path)
-                if len(data.shape) > 1:
-                    data = data.mean(axis=1)  # convert to mono for analysis
-                self.channels_data.append(data)
-                self.channels_sr.append(sr)
-            except Exception as e:
-                messagebox.showerror("Error", f"Error loading {path}: {e}")
-                return
-
-        # Load master WAV
         master_path = self.master_path.get()
         if master_path == "":
             messagebox.showerror("Error", "Please select a master WAV file.")
             return
 
+        # Loading runs in the background; poll_loading shows its progress and
+        # starts playback once everything is ready
+        midi_path = self.midi_path.get()
+        multichannel = (self.multichannel_path.get(), self.multichannel_mode.get() == "Pairs")
+        single_source = midi_path or multichannel[0]
+        paths = [self.wav_paths[i].get() if not single_source else "" for i in range(NUM_SLOTS)]
+        workers = self.analysis_workers.get()
+        self.load_updates = queue.Queue()
+        self.load_cancel = threading.Event()
+        for i, status in enumerate(self.slot_status):
+            status.set("")
+        self.master_status.set("")
+        self.load_result = None
+
+        self.render_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        self.load_thread = threading.Thread(
+            target=self.load_session,
+            args=(master_path, paths, midi_path, multichannel, self.analysis_hop.get(),
+                  self.analysis_window.get(), self.sample_storage.get(), workers),
+            daemon=True,
+        )
+        self.load_thread.start()
+        self.root.after(100, self.poll_loading)
+
+    def load_session(self, master_path, paths, midi_path, multichannel, hop_ms, window_ms, storage, workers):
+        # Loader thread: reads the master and analyses the slots at its rate,
+        # reusing cached envelopes when possible. The meters come from the MIDI
+        # file or the (path, pairs) multichannel WAV instead when given. Leaves ("ok", ...), ("error", message) or
+        # ("cancelled",) in load_result; never touches Tk.
+        updates, cancel = self.load_updates, self.load_cancel
         try:
-            master_data, master_sr = sf.read(master_path)
-            self.master_sr = master_sr
-            self.master_len = len(master_data)
+            # Length and rate come from the header; the audio is streamed while playing
+            info = sf.info(master_path)
+            master_sr = info.samplerate
+            master_len = info.frames
             pygame.mixer.quit()  # Re-init mixer for master sample rate
-            pygame.mixer.init(frequency=master_sr, channels=2, size=-16, buffer=512)
-            self.master_sound = pygame.mixer.Sound(master_path)
+            pygame.mixer.init(frequency=master_sr, channels=2, size=-16, buffer=MIXER_BUFFER,
+                              allowedchanges=MIXER_ALLOWED_CHANGES)
+            updates.put(("master", f"{info.duration / 60:.1f} min, streamed", 0, 0))
         except Exception as e:
-            messagebox.showerror("Error", f"Error loading master WAV: {e}")
+            self.load_result = ("error", f"Error loading master WAV: {e}")
+            return
+        if cancel.is_set():
+            self.load_result = ("cancelled",)
+            return
+
+        step_size, window_hops = analysis_steps(master_sr, hop_ms, window_ms)
+        readouts = {}
+        try:
+            if midi_path:
+                try:
+                    results, readouts = midi_slot_results(midi_path, master_sr, step_size)
+                except (OSError, ValueError, IndexError, struct.error) as e:
+                    raise RuntimeError(f"Error loading {midi_path}: {e}") from e
+                for i, result in enumerate(results):
+                    if result is not None:
+                        updates.put((i, "MIDI", 0, 0))
+            elif multichannel[0]:
+                results = analyze_multichannel(
+                    multichannel[0], master_sr, step_size, storage, window_hops, multichannel[1],
+                    updates, cancel
+                )
+            else:
+                results = analyze_slots(
+                    paths, master_sr, step_size, storage, workers, window_hops, updates, cancel
+                )
+        except LoadCancelled:
+            self.load_result = ("cancelled",)
+            return
+        except Exception as e:
+            self.load_result = ("error", str(e))
+            return
+        self.load_result = ("ok", master_path, master_sr, master_len, step_size, results, readouts)
+
+    def show_load_progress(self, index, stage, done_bytes, total_bytes):
+        if stage == "decoding" and total_bytes:
+            text = f"{done_bytes / 1e6:.1f}/{total_bytes / 1e6:.1f} MB"
+        elif stage == "done" and done_bytes:
+            text = f"done, {done_bytes / 1e6:.1f} MB"
+        else:
+            text = stage
+        if index == "master":
+            self.master_status.set(text)
+        elif index == "multi":
+            for status in self.slot_status:  # all slots decode in the same pass
+                status.set(text)
+        else:
+            self.slot_status[index].set(text)
+
+    def apply_midi_readouts(self, readouts):
+        # Instrument, patch and variant from the MIDI track names, program and bank changes
+        for i, (instrument, patch, variant) in readouts.items():
+            if instrument:
+                self.instrument_vars[i].set(instrument)
+            if patch:
+                self.patch_vars[i].set(patch)
+            if variant and self.variant_vars[i].get() != "---":
+                self.variant_vars[i].set(variant)
+
+    def poll_loading(self):
+        while True:
+            try:
+                update = self.load_updates.get_nowait()
+            except queue.Empty:
+                break
+            self.show_load_progress(*update)
+        if self.load_thread.is_alive():
+            self.root.after(100, self.poll_loading)
             return
 
+        self.load_thread = None
+        result = self.load_result
+        if result is None or result[0] != "ok":
+            if result and result[0] == "error":
+                messagebox.showerror("Error", result[1])
+            else:
+                for status in self.slot_status:
+                    if status.get() not in ("", "cached") and not status.get().startswith("done"):
+                        status.set("cancelled")
+            self.render_btn.config(state="normal")
+            self.stop_btn.config(state="disabled")
+            return
+
+        _, self.master_file, self.master_sr, self.master_len, step_size, results, readouts = result
+        self.apply_midi_readouts(readouts)
+        self.step_size = step_size
+        n_frames = -(-self.master_len // step_size)
+        self.envelopes, self.peaks, self.active_slots = assemble_envelopes(results, n_frames)
+
+        self.render_settings = self.snapshot_settings()
+        self.settings_queue = queue.Queue()
+        # Opened here so a name already in use is reported in the window
+        self.frame_publisher = None
+        if self.render_settings.publish_frames:
+            try:
+                self.frame_publisher = FramePublisher(GRID_COLS, GRID_ROWS, self.render_settings.frame_ring)
+            except (OSError, ValueError) as e:
+                messagebox.showwarning("Not Publishing Frames", f"Frames are not published: {e}")
         self.is_playing = True
         self.stop_flag = False
-        self.render_btn.config(state="disabled")
-        self.stop_btn.config(state="normal")
 
         self.render_thread = threading.Thread(target=self.render_loop, daemon=True)
         self.render_thread.start()
 
+    def snapshot_settings(self):
+        return RenderSettings(
+            sensitivity=self.bar_sensitivity.get(),
+            release=self.bar_release.get(),
+            contrast=self.contrast_mode.get(),
+            grid=self.grid_enabled.get(),
+            readouts=tuple(
+                (
+                    slot_name(i),
+                    self.instrument_vars[i].get(),
+                    self.patch_vars[i].get(),
+                    self.variant_vars[i].get(),
+                    self.set_vars[i].get(),
+                )
+                for i in range(NUM_SLOTS)
+            ),
+            display_rate=self.display_rate.get(),
+            latency=self.audio_latency.get() / 1000,
+            timing_log=self.timing_log.get(),
+            master_path=self.master_path.get(),
+            publish_frames=self.publish_frames.get(),
+            frame_ring=self.frame_ring.get(),
+        )
+
+    def publish_settings(self, *args):
+        # Tk variable trace: hand the render thread a fresh snapshot
+        if self.is_playing:
+            try:
+                self.settings_queue.put(self.snapshot_settings())
+            except tk.TclError:
+                pass  # a slider mid-edit; the next write publishes again
+
     def stop_render(self):
+        if self.load_thread:
+            self.load_cancel.set()  # poll_loading resets the buttons once the loader exits
+            self.stop_btn.config(state="disabled")
+            return
         self.stop_flag = True
         self.is_playing = False
         self.render_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
-        if self.master_sound:
-            self.master_sound.stop()
+        if self.master_player:
+            self.master_player.stop()
         pygame.mixer.stop()
         pygame.mixer.quit()
 
@@ -349,173 +1588,145 @@ class SD90Visualizer:
         pygame.display.init()
         icon = pygame.image.load('imageassets/SD90.png')
         pygame.display.set_icon(icon)
-        screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
+        settings = self.render_settings
+        display_rate = settings.display_rate
+        vsync = False
+        if display_rate == "VSync":
+            # vsync needs a scaled window; fall back to a fixed 60 FPS cap without it.
+            # With vsync the flip blocks until the refresh and paces the loop, so
+            # the clock only keeps a safety cap above any refresh rate, for
+            # minimised windows or drivers that force vsync off; fps sets the
+            # frame timing budget (the refresh rate where pygame reports it).
+            try:
+                screen = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.SCALED | pygame.RESIZABLE, vsync=1)
+                vsync = True
+                rates = getattr(pygame.display, "get_desktop_refresh_rates", lambda: [])()
+                fps = rates[0] if rates and rates[0] > 0 else 60
+            except pygame.error:
+                screen = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+                fps = 60
+        else:
+            screen = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+            fps = int(display_rate)
         pygame.display.set_caption("SD-90 LCD Visualizer")
 
-        self.bg_image_normal = pygame.image.load("imageassets/base.png").convert()
-        self.bg_image_invert = pygame.image.load("imageassets/contrast.png").convert()
-
         pygame.font.init()
-        font = pygame.font.Font(font_path, 70)
-
-        if self.contrast_mode.get():
-            bg_image = self.bg_image_invert
-            bar_color = BAR_COLOR_INVERT
-            grid_color = BAR_COLOR_INVERT
-            text_color = BAR_COLOR_INVERT
-        else:
-            bg_image = self.bg_image_normal
-            bar_color = BAR_COLOR_NORMAL
-            grid_color = BAR_COLOR_NORMAL
-            text_color = BAR_COLOR_NORMAL
-
-        # Resample all data to match master sample rate
-        for i in range(NUM_SLOTS):
-            data = self.channels_data[i]
-            sr = self.channels_sr[i]
-            if data is None:
-                continue
-            if sr != self.master_sr:
-                gcd = math.gcd(sr, self.master_sr)
-                up = self.master_sr // gcd
-                down = sr // gcd
-                self.channels_data[i] = resample_poly(data, up, down)
-                self.channels_sr[i] = self.master_sr
-
-        # Normalize amplitudes
-        max_vals = [np.max(np.abs(d)) if d is not None and len(d) > 0 else 1.0 for d in self.channels_data]
-        max_vals = [mv if mv > 0 else 1.0 for mv in max_vals]
-
-        bar_heights = [0.0] * NUM_SLOTS
-        last_update_time = time.time()
+        renderer = LCDRenderer()
+
+        # Instrumentation is only created when a timing log is requested
+        timing_log = settings.timing_log
+        timer = FrameTimer(fps) if timing_log != "Off" else None
+        publisher = self.frame_publisher
+
+        step_size = self.step_size
+        # Bar heights are looked up from a precomputed table, rebuilt off this
+        # thread when the sensitivity or release sliders move, and interpolated
+        # between analysis hops at the display rate
+        timelines = TimelineBuilder(
+            self.envelopes, self.peaks, self.active_slots, step_size / self.master_sr,
+            (settings.sensitivity, settings.release),
+        )
+        previous_frame = np.zeros((GRID_COLS, GRID_ROWS), dtype=np.uint8)
+        previous_state = None  # contrast, grid and window size the screen was last drawn with
 
-        if self.master_sound:
-            self.master_sound.play()
+        # The bars follow the audio clock of the master, not wall-clock time
+        player = MasterPlayer(self.master_file, self.master_sr, settings.latency)
+        self.master_player = player
+        player.start()
 
-        play_start_time = time.time()
         clock = pygame.time.Clock()
 
         while not self.stop_flag:
+            if timer:
+                timer.start()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.stop_flag = True
+                elif event.type == pygame.VIDEORESIZE:
+                    screen = pygame.display.get_surface()
+                    previous_state = None
+                elif event.type == pygame.VIDEOEXPOSE:
+                    previous_state = None
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_LEFT:
                         self.selected_bar = (self.selected_bar - 1) % NUM_SLOTS
                     elif event.key == pygame.K_RIGHT:
                         self.selected_bar = (self.selected_bar + 1) % NUM_SLOTS
+                    elif event.key == TIMING_OVERLAY_KEY and timer:
+                        timer.overlay = not timer.overlay
+                        previous_state = None
 
-            screen.blit(bg_image, (0, 0))
-            sel = self.selected_bar
-            label = f"A{sel+1:02}"
-            patch = self.patch_vars[sel].get()
-            variant = self.variant_vars[sel].get()
-            instrument = self.instrument_vars[sel].get()
-            set_text = self.set_vars[sel].get()
-
-            text_color = BAR_COLOR_NORMAL if not self.contrast_mode.get() else BAR_COLOR_INVERT
-
-            label_surf = font.render(label, True, text_color)
-            patch_surf = font.render(instrument, True, text_color)
-            instr_surf = font.render(patch, True, text_color)
-            vari_surf = font.render(variant, True, text_color)
-            set_surf = font.render(set_text, True, text_color)
-
-            instr_lbl = font.render("INST", True, text_color)
-            vari_lbl = font.render("VARIAT", True, text_color)
-            set_lbl = font.render("SET", True, text_color)
-
-            # First row: A00 + patch
-            screen.blit(label_surf, (6*BLOCK_SIZE, 41*BLOCK_SIZE))
-            screen.blit(patch_surf, (36*BLOCK_SIZE, 41*BLOCK_SIZE))
-
-            # Second row: instrument, variant, set (below A00 row)
-            screen.blit(instr_surf, (18*BLOCK_SIZE, 49*BLOCK_SIZE))
-            screen.blit(vari_surf, (60*BLOCK_SIZE, 49*BLOCK_SIZE))
-            screen.blit(set_surf, (90*BLOCK_SIZE, 49*BLOCK_SIZE))
-
+            cursor = max(player.position(), 0)
+            if timer:
+                timer.mark("events")
 
-            if self.grid_enabled.get():
-                for x in range(0, WINDOW_W, BLOCK_SIZE):
-                    pygame.draw.line(screen, grid_color, (x, 0), (x, WINDOW_H))
-                for y in range(0, WINDOW_H, BLOCK_SIZE):
-                    pygame.draw.line(screen, grid_color, (0, y), (WINDOW_W, y))
-
-            now = time.time()
-            dt = now - last_update_time
-            last_update_time = now
-
-            elapsed = time.time() - play_start_time
-            cursor = int(elapsed * self.master_sr)
-
-            if cursor >= self.master_len:
+            if player.done or cursor >= self.master_len:
                 self.stop_flag = True
                 continue
 
-            step_size = int(self.master_sr / 50)  # 50 FPS
-
-            for i in range(NUM_SLOTS):
-                data = self.channels_data[i]
-                height_blocks = 0
-                if data is not None and len(data) > 0:
-                    start_idx = cursor
-                    end_idx = min(cursor + step_size, len(data))
-                    window = data[start_idx:end_idx]
-                    amplitude = np.sqrt(np.mean(window ** 2)) if len(window) > 0 else 0.0
-                    norm_amp = min(amplitude / max_vals[i] * self.bar_sensitivity.get(), 1.0)
-
-                    target = norm_amp * BAR_MAX_HEIGHT_BLOCKS
-
-                    if target >= BAR_MAX_HEIGHT_BLOCKS * 0.98:
-                        bar_heights[i] = BAR_MAX_HEIGHT_BLOCKS
-                    elif target > bar_heights[i]:
-                        bar_heights[i] = target
-                    else:
-                        decay = math.exp(-dt / max(self.bar_release.get(), 1e-4))
-                        bar_heights[i] *= decay
-
-                    height_blocks = int(bar_heights[i])
-
-                base_x = BAR_START_X_BLOCK + i * (BAR_WIDTH_BLOCKS + BAR_SPACING_BLOCKS) + 1
-                base_y = BAR_BASELINE_Y_BLOCK - 1
-
-                for h in range(height_blocks):
-                    rect = pygame.Rect(
-                        base_x * BLOCK_SIZE,
-                        (base_y - h) * BLOCK_SIZE,
-                        BAR_WIDTH_BLOCKS * BLOCK_SIZE,
-                        BLOCK_SIZE
-                    )
-                    pygame.draw.rect(screen, bar_color, rect)
-                    
-                if self.bar_down_ext[i] > 0:
-                    dark_color = tuple(max(c - 80, 0) for c in bar_color)
-                    for h in range(self.bar_down_ext[i]):
-                        rect = pygame.Rect(
-                            base_x * BLOCK_SIZE,
-                            (base_y + 1 + h) * BLOCK_SIZE,
-                            BAR_WIDTH_BLOCKS * BLOCK_SIZE,
-                            BLOCK_SIZE
-                        )
-                        pygame.draw.rect(screen, dark_color, rect)
-
-                # Selected bar indicator
-                if i == self.selected_bar:
-                    rect = pygame.Rect(
-                        base_x * BLOCK_SIZE,
-                        (base_y + 1) * BLOCK_SIZE,
-                        BAR_WIDTH_BLOCKS * BLOCK_SIZE,
-                        BLOCK_SIZE
-                    )
-                    pygame.draw.rect(screen, bar_color, rect)
-
-
-            pygame.display.flip()
-            clock.tick(50)
+            # Pick up the latest settings snapshot published by the Tk thread
+            while True:
+                try:
+                    settings = self.settings_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            timelines.request((settings.sensitivity, settings.release))
+            bar_heights = bar_heights_at(timelines.timeline, hop_position(cursor, step_size))
+            if timer:
+                timer.mark("bars")
+
+            sel = self.selected_bar
+            slot_text = settings.readouts[sel]
+            contrast = settings.contrast
+            grid = settings.grid
+            if timer:
+                for text in slot_text:
+                    renderer.render_text(text)  # cache misses show up here instead of in compose
+                timer.mark("text")
+            frame_indices = renderer.compose(bar_heights, sel, slot_text, contrast, self.bar_down_ext)
+            if publisher:
+                publisher.publish(frame_indices, contrast, grid)
+            if timer:
+                timer.mark("compose")
+
+            # Only push the bars and readout rows that changed since the last
+            # frame, and nothing at all when the LCD is unchanged
+            state = (contrast, grid, screen.get_size())
+            dirty = renderer.dirty_regions(previous_frame, frame_indices) if state == previous_state else None
+            if dirty != []:
+                rects = renderer.present(screen, frame_indices, contrast, grid, dirty)
+                np.copyto(previous_frame, frame_indices)
+                previous_state = state
+                if timer and timer.overlay:
+                    rects.append(timer.draw_overlay(screen))
+                    previous_state = None  # the overlay covers the LCD, redraw it all next frame
+                if timer:
+                    timer.mark("present")
+                pygame.display.update(rects)
+                if timer:
+                    timer.mark("flip")
+            elif vsync:
+                pygame.display.update([])  # nothing changed, still wait for the refresh
+            cap = max(2 * fps, VSYNC_SAFETY_FPS) if vsync else fps
+            if timer:
+                timer.end(clock.tick(cap))
+            else:
+                clock.tick(cap)
 
         pygame.display.quit()
-        if self.master_sound:
-            self.master_sound.stop()
+        player.close()
+        timelines.close()
+        if publisher:
+            publisher.close()
+
+        if timer:
+            log_path = os.path.splitext(settings.master_path)[0] + "-timing." + timing_log.lower()
+            try:
+                timer.write_log(log_path)
+                print(f"Frame timing written to {log_path} ({timer.missed} missed frames)")
+            except OSError as e:
+                print(f"Could not write frame timing log: {e}")
 
         self.is_playing = False
         self.render_btn.config(state="normal")
@@ -533,11 +1744,495 @@ class SD90Visualizer:
         self.selected_bar = (self.selected_bar + 1) % NUM_SLOTS
 
     def on_closing(self):
+        if self.load_thread:
+            self.load_cancel.set()
         if self.is_playing:
             self.stop_flag = True
             if self.render_thread:
                 self.render_thread.join()
         self.root.destroy()
 
+def render_frames(renderer, start, heights, style, out_dir, stream):
+    # Draw frames start.. of a height table to PNGs in out_dir or raw RGB24 on stream
+    selected, slot_text, contrast, grid, size = style
+    surface = pygame.Surface(size)
+    for offset in range(heights.shape[1]):
+        renderer.draw(surface, heights[:, offset], selected, slot_text, contrast, grid)
+        if stream is not None:
+            stream.write(pygame.image.tobytes(surface, "RGB"))
+        else:
+            pygame.image.save(surface, os.path.join(out_dir, f"frame_{start + offset:06d}.png"))
+
+
+def export_chunk(start, heights, style, out_dir, segment_path):
+    # Export worker: renders one chunk, raw frames into its own segment file
+    pygame.font.init()
+    renderer = LCDRenderer()
+    if segment_path is None:
+        render_frames(renderer, start, heights, style, out_dir, None)
+    else:
+        with open(segment_path, "wb") as segment:
+            render_frames(renderer, start, heights, style, None, segment)
+
+
+def merge_export_chunk(job, segment_path):
+    job.result()
+    if segment_path is not None:
+        with open(segment_path, "rb") as segment:
+            shutil.copyfileobj(segment, sys.stdout.buffer)
+        os.remove(segment_path)
+
+
+def readout_text(args, selected, readouts={}):
+    # Readout texts of a slot for the command line modes: presets, then MIDI
+    # readouts, then the --instrument/--patch/--variant/--set overrides
+    instrument, patch, variant, set_text, _ = slot_presets(selected)
+    midi_instrument, midi_patch, midi_variant = readouts.get(selected, (None, None, None))
+    instrument = midi_instrument or instrument
+    patch = midi_patch or patch
+    variant = midi_variant if midi_variant and variant != "---" else variant
+    return (
+        slot_name(selected),
+        args.instrument if args.instrument is not None else instrument,
+        args.patch if args.patch is not None else patch,
+        args.variant if args.variant is not None else variant,
+        args.set if args.set is not None else set_text,
+    )
+
+
+def export_animation(args):
+    # Offline render: same analysis, ballistics and drawing as playback, but
+    # with a fixed frame step and no display or audio device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    info = sf.info(args.master)
+    master_sr = info.samplerate
+    step_size, window_hops = analysis_steps(master_sr, args.hop, args.window)
+    n_hops = -(-info.frames // step_size)
+
+    if args.midi:
+        results, readouts = midi_slot_results(args.midi, master_sr, step_size)
+    elif args.multichannel:
+        results = analyze_multichannel(
+            args.multichannel, master_sr, step_size, args.storage, window_hops, args.pairs
+        )
+        readouts = {}
+    else:
+        paths = (list(args.slots) + [""] * NUM_SLOTS)[:NUM_SLOTS]
+        results = analyze_slots(paths, master_sr, step_size, args.storage, args.workers, window_hops)
+        readouts = {}
+    envelopes, peaks, active = assemble_envelopes(results, n_hops)
+    timeline = compute_bar_timeline(
+        envelopes, peaks, active, args.sensitivity, args.release, step_size / master_sr
+    )
+    n_frames = int(math.ceil(info.frames * args.fps / master_sr))
+    heights = bar_heights_at(timeline, hop_position(np.arange(n_frames) * master_sr / args.fps, step_size))
+
+    selected = args.selected - 1
+    slot_text = readout_text(args, selected, readouts)
+
+    raw = args.export == "-"
+    out_dir = None if raw else args.export
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    style = (selected, slot_text, args.contrast, not args.no_grid, args.size)
+
+    if args.workers <= 1 or n_frames <= EXPORT_CHUNK_FRAMES:
+        pygame.font.init()
+        render_frames(LCDRenderer(), 0, heights, style, out_dir, sys.stdout.buffer if raw else None)
+    else:
+        # Frames are independent once the heights are known, so chunks render in
+        # parallel; raw chunks go to temporary segments that are copied to stdout
+        # in order, with a bounded number of chunks in flight
+        context = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+            pending = collections.deque()
+            for start in range(0, n_frames, EXPORT_CHUNK_FRAMES):
+                chunk = heights[:, start:start + EXPORT_CHUNK_FRAMES]
+                segment = os.path.join(tmp_dir, f"{start:08d}.rgb") if raw else None
+                pending.append((pool.submit(export_chunk, start, chunk, style, out_dir, segment), segment))
+                if len(pending) >= 2 * args.workers:
+                    merge_export_chunk(*pending.popleft())
+            while pending:
+                merge_export_chunk(*pending.popleft())
+    if raw:
+        sys.stdout.buffer.flush()
+    print(f"Exported {n_frames} frames at {args.fps:g} FPS ({args.size[0]}x{args.size[1]})",
+          file=sys.stderr)
+
+
+class LiveMeter:
+    # Incremental meters for interleaved PCM arriving in arbitrary chunks. Each
+    # completed hop's sum of squares goes into a fixed ring of window_hops
+    # entries per slot and the window sum is updated by adding the new hop and
+    # subtracting the one it replaces, so work per hop is O(hop) and memory
+    # never grows. Levels are normalised by the running sample peak and fed
+    # through the same attack/release ballistics as compute_bar_timeline.
+    def __init__(self, n_slots, step_size, window_hops, sr):
+        self.step_size = step_size
+        self.hop_dt = step_size / sr
+        self.partial = np.zeros(n_slots)  # sum of squares of the hop in progress
+        self.partial_count = 0
+        self.ring = np.zeros((window_hops, n_slots))
+        self.ring_pos = 0
+        self.window_sum = np.zeros(n_slots)
+        self.window_count = 0
+        self.peaks = np.zeros(n_slots)
+        self.heights = np.zeros(n_slots)  # bar heights in blocks after the latest hop
+        self.lock = threading.Lock()
+
+    def feed(self, block, sensitivity, release):
+        # block: float32 samples, one column per slot
+        self.peaks = np.maximum(self.peaks, np.max(np.abs(block), axis=0, initial=0.0))
+        squares = block.astype(np.float64) ** 2
+        pos = 0
+        while pos < len(squares):
+            take = min(self.step_size - self.partial_count, len(squares) - pos)
+            self.partial += squares[pos:pos + take].sum(axis=0)
+            self.partial_count += take
+            pos += take
+            if self.partial_count == self.step_size:
+                self.finish_hop(sensitivity, release)
+
+    def finish_hop(self, sensitivity, release):
+        self.window_sum += self.partial - self.ring[self.ring_pos]
+        self.ring[self.ring_pos] = self.partial
+        self.ring_pos = (self.ring_pos + 1) % len(self.ring)
+        self.window_count = min(self.window_count + 1, len(self.ring))
+        self.partial = np.zeros_like(self.partial)
+        self.partial_count = 0
+
+        levels = np.sqrt(np.maximum(self.window_sum, 0) / (self.window_count * self.step_size))
+        targets = bar_targets(levels, np.where(self.peaks > 0, self.peaks, 1.0), sensitivity)
+        decay = math.exp(-self.hop_dt / max(release, 1e-4))
+        with self.lock:
+            self.heights = np.maximum(targets, self.heights * decay)
+
+
+def read_live_source(source, meter, args, n_channels, group, stop):
+    # Reader thread for --live: feeds meter from raw interleaved PCM on stdin or
+    # a named pipe one hop at a time, paced to real time when the input is
+    # faster (e.g. a file piped in), until EOF or stop is set
+    dtype = np.dtype("<i2") if args.format == "s16" else np.dtype("<f4")
+    frame_bytes = n_channels * dtype.itemsize
+    hop_bytes = meter.step_size * frame_bytes
+    n_slots = len(meter.peaks)
+    stream = sys.stdin.buffer if source == "-" else open(source, "rb")
+    start = time.perf_counter()
+    frames_read = 0
+    leftover = b""
+    try:
+        while not stop.is_set():
+            data = stream.read(hop_bytes)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % frame_bytes
+            leftover = data[usable:]
+            samples = np.frombuffer(data[:usable], dtype=dtype).reshape(-1, n_channels)
+            if dtype.kind == "i":
+                samples = samples.astype(np.float32) / 32768
+            block = samples[:, :n_slots * group].reshape(len(samples), n_slots, group)
+            meter.feed(block.mean(axis=2, dtype=np.float32), args.sensitivity, args.release)
+            frames_read += len(samples)
+            ahead = frames_read / args.rate - (time.perf_counter() - start)
+            if ahead > 0.05:
+                time.sleep(ahead)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        stop.set()
+
+
+def run_live(args):
+    # Live meters from streamed raw PCM: channel n (or pair n with --pairs) of
+    # the input drives slot n, shown in a pygame window until the input ends
+    group = 2 if args.pairs else 1
+    n_channels = args.channels
+    n_slots = min(max(n_channels // group, 1), NUM_SLOTS)
+    step_size, window_hops = analysis_steps(args.rate, args.hop, args.window)
+    meter = LiveMeter(n_slots, step_size, window_hops, args.rate)
+    try:
+        publisher = FramePublisher(GRID_COLS, GRID_ROWS, args.publish) if args.publish else None
+    except (OSError, ValueError) as e:
+        sys.exit(f"Cannot publish frames: {e}")
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=read_live_source, args=(args.live, meter, args, n_channels, group, stop), daemon=True
+    )
+
+    pygame.init()
+    screen = pygame.display.set_mode(args.size, pygame.RESIZABLE)
+    pygame.display.set_caption("SD-90 LCD Visualizer (live)")
+    renderer = LCDRenderer()
+    clock = pygame.time.Clock()
+    selected = args.selected - 1
+    heights = np.zeros(NUM_SLOTS, dtype=np.int16)
+    previous_frame = np.zeros((GRID_COLS, GRID_ROWS), dtype=np.uint8)
+    previous_state = None
+    grid = not args.no_grid
+    reader.start()
+
+    while not stop.is_set():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                stop.set()
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                screen = pygame.display.get_surface()
+                previous_state = None
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    selected = (selected - 1) % NUM_SLOTS
+                elif event.key == pygame.K_RIGHT:
+                    selected = (selected + 1) % NUM_SLOTS
+
+        with meter.lock:
+            heights[:n_slots] = np.floor(meter.heights + 1e-4)
+        frame = renderer.compose(heights, selected, readout_text(args, selected), args.contrast)
+        if publisher:
+            publisher.publish(frame, args.contrast, grid)
+        state = (screen.get_size(),)
+        dirty = renderer.dirty_regions(previous_frame, frame) if state == previous_state else None
+        if dirty != []:
+            pygame.display.update(renderer.present(screen, frame, args.contrast, grid, dirty))
+            np.copyto(previous_frame, frame)
+            previous_state = state
+        clock.tick(args.fps)
+
+    reader.join(timeout=1.0)
+    if publisher:
+        publisher.close()
+    pygame.quit()
+
+
+def write_benchmark_stems(tmp_dir, seconds):
+    # Synthetic slot WAVs of mixed length, sample rate and channel count: decaying
+    # tone bursts at a different tempo per slot, plus a quiet stereo master
+    rng = np.random.default_rng(90)
+    rates = [44100, 48000, 22050, 96000]
+    paths = []
+    for i in range(NUM_SLOTS):
+        sr = rates[i % len(rates)]
+        channels = 1 + i % 2
+        n = int(sr * seconds * (1.0 - 0.25 * (i % 4) / 3))
+        t = np.arange(n) / sr
+        beat = 0.25 + 0.05 * i
+        burst = np.exp(-8 * (t % beat)) * np.sin(2 * np.pi * (110 * (i + 1)) * t)
+        data = burst[:, None] * rng.uniform(0.2, 0.9, channels) + rng.normal(0, 0.01, (n, channels))
+        path = os.path.join(tmp_dir, f"{slot_name(i)}.wav")
+        sf.write(path, np.clip(data, -1, 1).astype(np.float32), sr, subtype="PCM_16")
+        paths.append(path)
+    master = os.path.join(tmp_dir, "master.wav")
+    sf.write(master, rng.normal(0, 0.05, (int(44100 * seconds), 2)).astype(np.float32), 44100, subtype="PCM_16")
+    return master, paths
+
+
+def timing_summary(samples):
+    # Mean and 95th percentile of a list of durations in seconds, in milliseconds
+    ms = np.asarray(samples) * 1000
+    return {"mean": round(float(ms.mean()), 4), "p95": round(float(np.percentile(ms, 95)), 4)}
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in KiB on Linux
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(usage, children) * scale
+
+
+def run_benchmark(args):
+    # Time every stage of a render on synthetic stems under SDL's dummy drivers
+    # and report the results as JSON
+    global CACHE_DIR
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        master_path, paths = write_benchmark_stems(tmp_dir, args.bench_seconds)
+        CACHE_DIR = os.path.join(tmp_dir, "cache")  # start cold, leave the user cache alone
+
+        start = time.perf_counter()
+        info = sf.info(master_path)
+        stages["master_open"] = time.perf_counter() - start
+        master_sr, master_len = info.samplerate, info.frames
+
+        step_size, window_hops = analysis_steps(master_sr, args.hop, args.window)
+        n_hops = -(-master_len // step_size)
+        start = time.perf_counter()
+        results = analyze_slots(paths, master_sr, step_size, args.storage, args.workers, window_hops)
+        stages["slot_analysis"] = time.perf_counter() - start
+        start = time.perf_counter()
+        analyze_slots(paths, master_sr, step_size, args.storage, args.workers, window_hops)
+        stages["slot_analysis_cached"] = time.perf_counter() - start
+
+        envelopes, peaks, active = assemble_envelopes(results, n_hops)
+        start = time.perf_counter()
+        timeline = compute_bar_timeline(
+            envelopes, peaks, active, args.sensitivity, args.release, step_size / master_sr
+        )
+        stages["bar_timeline"] = time.perf_counter() - start
+
+    pygame.init()
+    screen = pygame.display.set_mode(args.size)
+    renderer = LCDRenderer()
+
+    readouts = [(slot_name(i),) + slot_presets(i)[:4] for i in range(NUM_SLOTS)]
+    text_times = []
+    for readout in readouts:
+        for text in readout:
+            start = time.perf_counter()
+            renderer.render_text(text)
+            text_times.append(time.perf_counter() - start)
+    renderer.text_cache.clear()
+
+    # Same per-frame path as the live window, without waiting for the clock;
+    # the selected slot moves once a second like a user stepping through slots
+    n_frames = int(math.ceil(master_len * args.fps / master_sr))
+    frame_times = {name: [] for name in ("interpolate", "compose", "present", "flip", "total")}
+    previous_frame = np.zeros((GRID_COLS, GRID_ROWS), dtype=np.uint8)
+    first = True
+    grid = not args.no_grid
+    for k in range(n_frames):
+        selected = int(k // args.fps) % NUM_SLOTS
+        t0 = time.perf_counter()
+        heights = bar_heights_at(timeline, hop_position(k * master_sr / args.fps, step_size))
+        t1 = time.perf_counter()
+        frame = renderer.compose(heights, selected, readouts[selected], args.contrast)
+        dirty = None if first else renderer.dirty_regions(previous_frame, frame)
+        t2 = time.perf_counter()
+        rects = renderer.present(screen, frame, args.contrast, grid, dirty) if dirty != [] else []
+        t3 = time.perf_counter()
+        if rects:
+            pygame.display.update(rects)
+        np.copyto(previous_frame, frame)
+        first = False
+        t4 = time.perf_counter()
+        for name, seconds in zip(frame_times, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+            frame_times[name].append(seconds)
+    pygame.quit()
+
+    report = {
+        "config": {
+            "seconds": args.bench_seconds,
+            "slots": NUM_SLOTS,
+            "frames": n_frames,
+            "fps": args.fps,
+            "hop_ms": args.hop,
+            "window_ms": args.window,
+            "size": list(args.size),
+            "storage": args.storage,
+            "workers": args.workers,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in stages.items()},
+        "text_render_ms": timing_summary(text_times),
+        "frame_ms": {name: timing_summary(times) for name, times in frame_times.items()},
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+    output = json.dumps(report, indent=2)
+    if args.benchmark == "-":
+        print(output)
+    else:
+        with open(args.benchmark, "w") as f:
+            f.write(output + "\n")
+
+
+def parse_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < GRID_COLS or height < GRID_ROWS:
+        raise argparse.ArgumentTypeError(f"size must be at least {GRID_COLS}x{GRID_ROWS}")
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Edirol SD-90 LCD visualizer")
+    parser.add_argument("--export", metavar="DIR",
+                        help="render offline to a PNG sequence in DIR, or raw RGB24 frames "
+                             "on stdout with '-', instead of opening the window")
+    parser.add_argument("--benchmark", nargs="?", const="-", metavar="FILE",
+                        help="time loading, analysis and drawing on synthetic stems and "
+                             "write the results as JSON to FILE (stdout by default)")
+    parser.add_argument("--bench-seconds", type=float, default=10.0,
+                        help="length of the synthetic benchmark stems (default 10)")
+    parser.add_argument("--master", help="master WAV, sets the length and frame grid")
+    parser.add_argument("--slots", nargs="*", default=[], metavar="WAV",
+                        help=f"up to {NUM_SLOTS} slot WAVs in A01..A16, B01..B16 order, "
+                             "'' to leave a slot empty")
+    parser.add_argument("--midi", metavar="MID",
+                        help="drive the slot meters and readouts from a Standard MIDI File "
+                             "(channel n = slot n) instead of slot WAVs")
+    parser.add_argument("--multichannel", metavar="WAV",
+                        help="one interleaved multichannel WAV/RF64 feeding the slots, "
+                             "channel n = slot n")
+    parser.add_argument("--pairs", action="store_true",
+                        help="with --multichannel or --live, one stereo channel pair per slot")
+    parser.add_argument("--live", metavar="SOURCE",
+                        help="live meters from raw interleaved PCM read from SOURCE, "
+                             "a named pipe or '-' for stdin")
+    parser.add_argument("--publish", nargs="?", const=FRAME_RING_NAME, metavar="NAME",
+                        help="with --live, publish every LCD frame to a shared-memory ring "
+                             f"(default name {FRAME_RING_NAME}) for sdlcd_frames.FrameReader")
+    parser.add_argument("--rate", type=int, default=44100, help="--live sample rate (default 44100)")
+    parser.add_argument("--channels", type=int, default=PAGE_SIZE,
+                        help=f"--live interleaved channel count (default {PAGE_SIZE})")
+    parser.add_argument("--format", choices=["s16", "f32"], default="s16",
+                        help="--live little-endian sample format (default s16)")
+    parser.add_argument("--sensitivity", type=float, default=1.0, help="bar amplification gain")
+    parser.add_argument("--release", type=float, default=0.5, help="bar release time in seconds")
+    parser.add_argument("--contrast", action="store_true", help="contrast mode (invert colors)")
+    parser.add_argument("--no-grid", action="store_true", help="disable the grid")
+    parser.add_argument("--fps", type=float, default=DEFAULT_DISPLAY_RATE,
+                        help=f"exported or live frame rate (default {DEFAULT_DISPLAY_RATE})")
+    parser.add_argument("--hop", type=float, default=ANALYSIS_HOP_MS,
+                        help=f"envelope hop in milliseconds (default {ANALYSIS_HOP_MS})")
+    parser.add_argument("--window", type=float, default=ANALYSIS_WINDOW_MS,
+                        help=f"RMS window in milliseconds (default {ANALYSIS_WINDOW_MS})")
+    parser.add_argument("--size", type=parse_size, default=(WINDOW_W, WINDOW_H), metavar="WxH",
+                        help=f"exported frame size (default {WINDOW_W}x{WINDOW_H})")
+    parser.add_argument("--selected", type=int, default=1, choices=range(1, NUM_SLOTS + 1),
+                        metavar="N", help=f"slot shown in the readout (1-{NUM_SLOTS}, "
+                                          f"{PAGE_SIZE + 1} and up are the B parts)")
+    parser.add_argument("--instrument", help="readout instrument name")
+    parser.add_argument("--patch", help="readout patch number")
+    parser.add_argument("--variant", help="readout patch variant")
+    parser.add_argument("--set", choices=SET_OPTIONS, help="readout instrument set")
+    parser.add_argument("--storage", choices=SAMPLE_STORAGE_OPTIONS, default=SAMPLE_STORAGE_OPTIONS[0],
+                        help="sample format used while decoding slots")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="processes used for slot analysis and frame export")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args)
+    elif args.live:
+        if args.channels < 1:
+            parser.error("--channels must be at least 1")
+        if args.pairs and args.channels < 2:
+            parser.error("--pairs needs at least 2 --channels")
+        if args.rate < 1:
+            parser.error("--rate must be at least 1")
+        run_live(args)
+    elif args.export:
+        if not args.master:
+            parser.error("--export requires --master")
+        if len(args.slots) > NUM_SLOTS:
+            parser.error(f"at most {NUM_SLOTS} slot WAVs")
+        export_animation(args)
+    else:
+        SD90Visualizer()
+
+
 if __name__ == "__main__":
-    SD90Visualizer()
+    multiprocessing.freeze_support()
+    main()
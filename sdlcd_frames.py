@@ -0,0 +1,176 @@
+# Shared-memory ring of LCD frames published by SD-LCD, and a reader for
+# other local processes (OBS scripts, display drivers, recorders).
+#
+# Layout, little-endian:
+#   header  magic "SDLC", version u32, columns u16, rows u16, slots u32,
+#           owner pid u32, padding u32, counter u64
+#   slot k  sequence u64, flags u32 (bit 0 contrast, bit 1 grid), padding u32,
+#           columns * rows u8 palette indices (0 paper, 1 ink, 2 dark), x-major
+# Frame n (counting from 1) lives in slot n % slots. The writer clears the
+# slot's sequence, writes the frame, sets the sequence to n and then the
+# header counter to n, so a reader can tell a torn or overwritten frame by
+# the sequence changing while it reads. A segment left behind by a renderer
+# that died is reclaimed by the next one; a live owner's segment never is.
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+FRAME_RING_NAME = "sd-lcd-frames"
+FRAME_RING_SLOTS = 8
+FRAME_RING_VERSION = 2
+
+HEADER = struct.Struct("<4sIHHII4xQ")
+SLOT_HEADER = struct.Struct("<QII")
+COUNTER_OFFSET = HEADER.size - 8
+
+FLAG_CONTRAST = 1
+FLAG_GRID = 2
+
+
+def slot_size(columns, rows):
+    return SLOT_HEADER.size + columns * rows
+
+
+def attach(name):
+    # Attach to an existing segment without letting this process's resource
+    # tracker unlink it on exit (Python < 3.13 always tracks attached segments)
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def process_alive(pid):
+    # Windows frees a segment with its last handle, so one that still exists
+    # there always has a live user
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def ring_owner(shm):
+    # Owner pid of an existing segment, or None when it is not a frame ring of this version
+    try:
+        magic, version, _, _, _, pid, _ = HEADER.unpack_from(shm.buf, 0)
+    except struct.error:
+        return None
+    return pid if magic == b"SDLC" and version == FRAME_RING_VERSION else None
+
+
+class FramePublisher:
+    # Writer side, owned by the renderer: one copy of each frame into the ring
+    # however many readers there are
+    def __init__(self, columns, rows, name=FRAME_RING_NAME, slots=FRAME_RING_SLOTS):
+        size = HEADER.size + slots * slot_size(columns, rows)
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            existing = attach(name)
+            owner = ring_owner(existing)
+            if owner is None or process_alive(owner):
+                existing.close()
+                raise FileExistsError(
+                    f"shared memory {name} is in use"
+                    + (f" by SD-LCD process {owner}" if owner else "")
+                    + "; publish under another name"
+                ) from None
+            # Left behind by a renderer that did not exit cleanly
+            existing.close()
+            existing.unlink()
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self.columns, self.rows, self.slots = columns, rows, slots
+        HEADER.pack_into(self.shm.buf, 0, b"SDLC", FRAME_RING_VERSION, columns, rows, slots, os.getpid(), 0)
+        self.counter = np.ndarray((), dtype="<u8", buffer=self.shm.buf, offset=COUNTER_OFFSET)
+        self.sequences = []
+        self.flags = []
+        self.frames = []
+        for k in range(slots):
+            offset = HEADER.size + k * slot_size(columns, rows)
+            self.sequences.append(np.ndarray((), dtype="<u8", buffer=self.shm.buf, offset=offset))
+            self.flags.append(np.ndarray((), dtype="<u4", buffer=self.shm.buf, offset=offset + 8))
+            self.frames.append(np.ndarray(
+                (columns, rows), dtype=np.uint8, buffer=self.shm.buf, offset=offset + SLOT_HEADER.size
+            ))
+        self.published = 0
+
+    def publish(self, frame, contrast=False, grid=True):
+        n = self.published + 1
+        k = n % self.slots
+        self.sequences[k][()] = 0
+        np.copyto(self.frames[k], frame)
+        self.flags[k][()] = (FLAG_CONTRAST if contrast else 0) | (FLAG_GRID if grid else 0)
+        self.sequences[k][()] = n
+        self.counter[()] = n
+        self.published = n
+
+    def close(self):
+        del self.counter, self.sequences, self.flags, self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FrameReader:
+    # Reader side. latest() hands out a zero-copy view of the newest frame,
+    # valid(n) tells whether it is still intact; read() returns a checked copy.
+    #
+    #   reader = FrameReader()
+    #   n = 0
+    #   while True:
+    #       n, frame, flags = reader.read(after=n, timeout=1.0) or (n, None, 0)
+    def __init__(self, name=FRAME_RING_NAME):
+        self.shm = attach(name)
+        magic, version, columns, rows, slots, _, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != b"SDLC" or version != FRAME_RING_VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not an SD-LCD frame ring (version {FRAME_RING_VERSION})")
+        self.columns, self.rows, self.slots = columns, rows, slots
+        self.counter = np.ndarray((), dtype="<u8", buffer=self.shm.buf, offset=COUNTER_OFFSET)
+        self.slot_offsets = [HEADER.size + k * slot_size(columns, rows) for k in range(slots)]
+
+    def sequence(self, n):
+        return int(np.ndarray((), dtype="<u8", buffer=self.shm.buf, offset=self.slot_offsets[n % self.slots]))
+
+    def valid(self, n):
+        return n > 0 and self.sequence(n) == n
+
+    def latest(self):
+        # (frame number, view of its palette indices, flags); 0 and None before the first frame
+        n = int(self.counter)
+        if n == 0:
+            return 0, None, 0
+        offset = self.slot_offsets[n % self.slots]
+        flags = int(np.ndarray((), dtype="<u4", buffer=self.shm.buf, offset=offset + 8))
+        view = np.ndarray((self.columns, self.rows), dtype=np.uint8, buffer=self.shm.buf,
+                          offset=offset + SLOT_HEADER.size)
+        return n, view, flags
+
+    def read(self, after=0, timeout=None, poll=0.002):
+        # Copy of the newest frame numbered above after, or None on timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            n, view, flags = self.latest()
+            if n > after:
+                frame = view.copy()
+                if self.valid(n):
+                    return n, frame, flags
+                continue  # overwritten while copying, take the newer one
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self):
+        del self.counter
+        self.shm.close()